@@ -0,0 +1,146 @@
+"""Benchmark polling and write throughput against the local emulator.
+
+Run from the repository root with Home Assistant and httpx installed::
+
+    python -m benchmarks.bench --devices 1,10,100,500 --latency 0.05
+
+For every device count the benchmark reports wall time, HTTP requests and
+peak memory of a full setup (login plus device list), of a forced poll cycle
+in each poll mode and of one register write per device, with the number of
+failed devices or writes.
+"""
+
+import argparse
+import asyncio
+import time
+import tracemalloc
+
+import httpx
+
+from custom_components.totalcontrol.const import JsonDataField, PollMode
+from custom_components.totalcontrol.scheduler import RequestScheduler
+from custom_components.totalcontrol.totalcontrol import totalcontrol, totalcontrolError
+
+from .emulator import ExtraflameEmulator
+
+UNLIMITED = 1_000_000
+
+
+async def measure(emulator, coro):
+    """Run coro, return its wall time, request count, errors and peak memory."""
+    emulator.reset_counters()
+    tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        errors = await coro
+    except totalcontrolError:
+        errors = "all"
+    finally:
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return elapsed, emulator.request_count, errors or 0, peak
+
+
+async def setup(emulator, client, args, poll_mode=PollMode.DEVICE):
+    """Create and connect a totalcontrol instance against the emulator."""
+    agua = totalcontrol(
+        email="bench@example.com",
+        password="bench",
+        unique_id="bench",
+        max_concurrency=args.concurrency,
+        poll_mode=poll_mode,
+        http_client=client,
+        scheduler=RequestScheduler(rate=args.rate or UNLIMITED, burst=UNLIMITED),
+    )
+    await agua.connect()
+    return agua
+
+
+async def update(agua):
+    """Poll every device, return the number of failed devices."""
+    await agua.update(force=True)
+    return sum(1 for dev in agua.devices if dev.failures)
+
+
+async def write_all(agua):
+    """Write a new pellet power to every device, return the failed writes."""
+    results = await asyncio.gather(
+        *(
+            dev.set_register_value(JsonDataField.TARGET_POWER, 5)
+            for dev in agua.devices
+        ),
+        return_exceptions=True,
+    )
+    return sum(1 for result in results if isinstance(result, Exception))
+
+
+async def bench_devices(count, args):
+    """Run all scenarios for one device count."""
+    emulator = ExtraflameEmulator(
+        devices=count,
+        latency=args.latency,
+        error_rate=args.error_rate,
+        token_ttl=args.token_ttl,
+    )
+    results = []
+    async with httpx.AsyncClient(transport=emulator.transport) as client:
+        holder = {}
+
+        async def full_setup():
+            holder["agua"] = await setup(emulator, client, args)
+
+        results.append(("setup", *await measure(emulator, full_setup())))
+        agua = holder.get("agua")
+        if agua is None:
+            print(f"{count:>7} setup failed")
+            return
+
+        for poll_mode in PollMode:
+            agua.poll_mode = poll_mode
+            results.append(
+                (f"update ({poll_mode})", *await measure(emulator, update(agua)))
+            )
+
+        agua.poll_mode = PollMode.DEVICE
+        results.append(("write", *await measure(emulator, write_all(agua))))
+        await agua.close()
+
+    for scenario, elapsed, requests, errors, peak in results:
+        print(
+            f"{count:>7} {scenario:<16} {elapsed * 1000:>10.1f} "
+            f"{requests:>9} {errors:>7} {peak / 1024:>10.1f}"
+        )
+
+
+async def main(args):
+    """Run the benchmark for all device counts."""
+    print(
+        f"{'devices':>7} {'scenario':<16} {'time (ms)':>10} "
+        f"{'requests':>9} {'errors':>7} {'peak (KiB)':>10}"
+    )
+    for count in args.devices:
+        await bench_devices(count, args)
+
+
+def parse_args():
+    """Parse the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--devices",
+        type=lambda value: [int(count) for count in value.split(",")],
+        default=[1, 10, 100, 500],
+        help="comma separated device counts",
+    )
+    parser.add_argument("--latency", type=float, default=0.02, help="seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--token-ttl", type=float, default=3600, help="seconds")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument(
+        "--rate", type=float, default=0, help="requests per second, 0 for unlimited"
+    )
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(parse_args()))
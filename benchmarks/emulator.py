@@ -0,0 +1,158 @@
+"""Local stand-in for the Extraflame total control cloud.
+
+The emulator serves the endpoints used by ``totalcontrol.py`` through an
+``httpx.MockTransport``, so the integration can be driven without network
+access::
+
+    emulator = ExtraflameEmulator(devices=100, latency=0.05)
+    client = httpx.AsyncClient(transport=emulator.transport)
+    agua = totalcontrol(email, password, unique_id, http_client=client)
+"""
+
+import asyncio
+from collections import Counter
+import json
+import random
+import time
+
+import httpx
+
+from custom_components.totalcontrol.const import REGISTERS
+from custom_components.totalcontrol.totalcontrol import (
+    API_PATH_DEVICE_INFO,
+    API_PATH_DEVICE_LIST,
+    API_PATH_DEVICE_WRITING,
+    API_PATH_LOGIN,
+)
+
+RESULT_OK = 0
+RESULT_INVALID_TOKEN = 1
+RESULT_INVALID_REQUEST = 2
+
+PARAMETER_REGISTERS = {
+    register["parameterId"]: key
+    for key, register in REGISTERS.items()
+    if "parameterId" in register
+}
+
+
+class ExtraflameEmulator:
+    """Emulate a total control account with a configurable number of stoves."""
+
+    def __init__(
+        self,
+        devices=1,
+        latency=0.0,
+        error_rate=0.0,
+        token_ttl=3600,
+        seed=0,
+    ) -> None:
+        """Initialize the emulator.
+
+        ``latency`` is the response delay in seconds, ``error_rate`` the share
+        of requests answered with HTTP 500 and ``token_ttl`` the lifetime of
+        issued tokens in seconds.
+        """
+        self.latency = latency
+        self.error_rate = error_rate
+        self.token_ttl = token_ttl
+        self.requests = Counter()
+        self.tokens = {}
+        self.__random = random.Random(seed)
+        self.devices = {
+            f"00:00:00:00:{index // 256:02x}:{index % 256:02x}": self.__stove_state()
+            for index in range(devices)
+        }
+        self.serials = {
+            mac: f"EMU{index:05d}" for index, mac in enumerate(self.devices)
+        }
+
+    @property
+    def transport(self):
+        """Return a transport serving the emulated endpoints."""
+        return httpx.MockTransport(self.handle_request)
+
+    @property
+    def request_count(self):
+        """Return the number of requests served."""
+        return sum(self.requests.values())
+
+    def reset_counters(self):
+        """Forget the requests served so far."""
+        self.requests.clear()
+
+    def expire_tokens(self):
+        """Invalidate all issued tokens."""
+        self.tokens.clear()
+
+    def __stove_state(self):
+        state = {key: 0 for key in REGISTERS}
+        state.update(
+            {
+                "creationDate": "2024-01-01 00:00:00",
+                "roomTemp": round(self.__random.uniform(15, 22), 1),
+                "waterTemp": round(self.__random.uniform(30, 70), 1),
+                "smokeTemp": round(self.__random.uniform(20, 150), 1),
+                "targetRoomTemp": 70,
+                "targetPower": 3,
+                "targetWaterTemp": 70,
+            }
+        )
+        return state
+
+    async def handle_request(self, request):
+        """Answer a request like the total control cloud."""
+        path = request.url.path
+        self.requests[path] += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+        if self.error_rate and self.__random.random() < self.error_rate:
+            return httpx.Response(500)
+
+        params = request.url.params
+        if path == API_PATH_LOGIN:
+            token = f"token-{len(self.tokens)}-{self.__random.random()}"
+            self.tokens[token] = time.monotonic() + self.token_ttl
+            return self.__response(RESULT_OK, {"token": token})
+
+        if self.tokens.get(params.get("token"), 0) < time.monotonic():
+            return self.__response(RESULT_INVALID_TOKEN)
+
+        if path == API_PATH_DEVICE_LIST:
+            return self.__response(
+                RESULT_OK,
+                [
+                    {
+                        "serial": self.serials[mac],
+                        "codArt": "EMULATOR",
+                        "friendlyName": f"Stove {self.serials[mac]}",
+                        "mac": mac,
+                        "stoveState": dict(state),
+                    }
+                    for mac, state in self.devices.items()
+                ],
+            )
+
+        state = self.devices.get(params.get("mac"))
+        if state is None:
+            return self.__response(RESULT_INVALID_REQUEST)
+
+        if path == API_PATH_DEVICE_INFO:
+            return self.__response(RESULT_OK, dict(state))
+
+        if path == API_PATH_DEVICE_WRITING:
+            key = PARAMETER_REGISTERS.get(int(params.get("parameterId", -1)))
+            if key is None:
+                return self.__response(RESULT_INVALID_REQUEST)
+            state[key] = int(params["parameterValue"])
+            return self.__response(RESULT_OK)
+
+        return httpx.Response(404)
+
+    @staticmethod
+    def __response(result_code, data=None):
+        content = {"resultCode": result_code}
+        if data is not None:
+            content["data"] = data
+        return httpx.Response(200, content=json.dumps(content).encode())
@@ -1,16 +1,40 @@
 """Support for Micronova Agua IOT heating devices."""
 
-from datetime import timedelta
+from functools import partial
 import logging
+from urllib.parse import urlsplit
 
 from homeassistant.config_entries import SOURCE_IMPORT, ConfigEntry
 from homeassistant.const import CONF_EMAIL, CONF_PASSWORD, EVENT_HOMEASSISTANT_STOP
-from homeassistant.core import Event, HomeAssistant
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.httpx_client import get_async_client
 from homeassistant.helpers.typing import ConfigType
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 
-from .const import CONF_UUID, DOMAIN, PLATFORMS, UPDATE_INTERVAL
-from .totalcontrol import totalcontrol, totalcontrolError
+from .const import (
+    CONF_MAX_CONCURRENCY,
+    CONF_POLL_MODE,
+    CONF_REQUEST_BURST,
+    CONF_REQUEST_RATE,
+    CONF_STALE_TTL,
+    CONF_TRACE_MODE,
+    CONF_UUID,
+    DATA_STORES,
+    DOMAIN,
+    PLATFORMS,
+    POLL_INTERVALS,
+    STALE_TTL,
+    PollMode,
+)
+from .coordinator import async_get_store, totalcontrolCoordinator
+from .scheduler import get_scheduler
+from .services import async_setup_services
+from .totalcontrol import (
+    API_URL,
+    DEFAULT_MAX_CONCURRENCY,
+    totalcontrol,
+    totalcontrolError,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -25,6 +49,8 @@ async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
                 )
             )
 
+    await async_setup_services(hass)
+
     return True
 
 
@@ -34,58 +60,131 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     password = entry.data[CONF_PASSWORD]
     gen_uuid = entry.data[CONF_UUID]
 
+    # Only explicitly configured limits change the scheduler shared with the
+    # other accounts, which all get the lowest configured rate and burst.
+    scheduler = get_scheduler(
+        urlsplit(API_URL).hostname,
+        owner=entry.entry_id,
+        rate=entry.options.get(CONF_REQUEST_RATE),
+        burst=entry.options.get(CONF_REQUEST_BURST),
+    )
     agua = totalcontrol(
         email=email,
         password=password,
         unique_id=gen_uuid,
+        max_concurrency=entry.options.get(
+            CONF_MAX_CONCURRENCY, DEFAULT_MAX_CONCURRENCY
+        ),
+        poll_mode=entry.options.get(CONF_POLL_MODE, PollMode.DEVICE),
+        poll_intervals={
+            option: entry.options[option]
+            for option in POLL_INTERVALS
+            if option in entry.options
+        },
+        http_client=get_async_client(hass),
+        stale_ttl=entry.options.get(CONF_STALE_TTL, STALE_TTL),
+        scheduler=scheduler,
+        trace_mode=entry.options.get(CONF_TRACE_MODE, False),
     )
 
-    try:
-        await agua.connect()
-    except totalcontrolError as error:
-        _LOGGER.error("Unable to login: %s", error)
-        return False
-
-    async def async_update_data():
-        """Get the latest data."""
+    # Create the entities from the cached devices and revalidate them in the
+    # background, only contact the cloud up front when there is no cache.
+    store = async_get_store(hass, gen_uuid)
+    cache = await store.async_load()
+    restored = bool(cache) and agua.restore_cache(cache)
+    if not restored:
         try:
-            await agua.update()
+            await agua.connect()
         except totalcontrolError as error:
-            _LOGGER.error("Unable to fetch data: %s", error)
+            _LOGGER.error("Unable to login: %s", error)
+            await agua.close()
+            scheduler.remove_limits(entry.entry_id)
             return False
 
-    coordinator = DataUpdateCoordinator(
-        hass,
-        _LOGGER,
-        name="totalcontrol",
-        update_method=async_update_data,
-        update_interval=timedelta(seconds=UPDATE_INTERVAL),
-    )
-
-    await coordinator.async_config_entry_first_refresh()
+    coordinator = totalcontrolCoordinator(hass, agua, store)
 
     hass.data.setdefault(DOMAIN, {})[entry.entry_id] = {
         "coordinator": coordinator,
         "agua": agua,
+        "store": store,
     }
+    _async_remove_stale_devices(hass, entry, agua)
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
+    @callback
+    def async_check_devices() -> None:
+        """Reload to add or remove entities when the stove list changed."""
+        if agua.devices_changed:
+            agua.devices_changed = False
+            hass.async_create_task(hass.config_entries.async_reload(entry.entry_id))
+
+    async def async_revalidate() -> None:
+        """Reconcile the cached devices with the cloud, then refresh them."""
+        if restored:
+            try:
+                await agua.sync_devices()
+            except totalcontrolError as error:
+                _LOGGER.warning("Unable to fetch the device list: %s", error)
+            if agua.devices_changed:
+                async_check_devices()
+                return
+        await coordinator.async_refresh()
+
+    entry.async_on_unload(coordinator.async_add_listener(async_check_devices))
+    entry.async_on_unload(coordinator.async_cancel_stale_check)
+    entry.async_on_unload(partial(scheduler.remove_limits, entry.entry_id))
+    entry.async_create_background_task(
+        hass, async_revalidate(), "totalcontrol revalidate"
+    )
+
     # Services
     async def async_close_connection(event: Event) -> None:
         """Close totalcontrol connection on HA Stop."""
-        # await agua.close()
+        await agua.close()
 
     entry.async_on_unload(
         hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, async_close_connection)
     )
+    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
 
     return True
 
 
+@callback
+def _async_remove_stale_devices(hass: HomeAssistant, entry: ConfigEntry, agua) -> None:
+    """Remove the stoves that are no longer part of the account."""
+    identifiers = {(DOMAIN, device.id) for device in agua.devices}
+    identifiers.add((DOMAIN, agua.unique_id))
+    device_registry = dr.async_get(hass)
+    for device_entry in dr.async_entries_for_config_entry(
+        device_registry, entry.entry_id
+    ):
+        if not device_entry.identifiers & identifiers:
+            device_registry.async_update_device(
+                device_entry.id, remove_config_entry_id=entry.entry_id
+            )
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
-        hass.data[DOMAIN].pop(entry.entry_id)
+        data = hass.data[DOMAIN].pop(entry.entry_id)
+        await data["agua"].close()
+        # Save right away, replacing the pending delayed save, so a reload
+        # starts from the latest statistics.
+        await data["store"].async_save(data["agua"].as_cache())
 
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the cached devices of a config entry."""
+    store = async_get_store(hass, entry.data[CONF_UUID])
+    hass.data[DATA_STORES].pop(entry.data[CONF_UUID])
+    await store.async_remove()
+
+
+async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload a config entry after its options changed."""
+    await hass.config_entries.async_reload(entry.entry_id)
@@ -0,0 +1,75 @@
+"""Circuit breaker for requests to the total control cloud."""
+
+from enum import StrEnum
+import time
+
+
+class BreakerState(StrEnum):
+    """Available circuit breaker states."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Short-circuit requests after repeated transient failures.
+
+    After ``failure_threshold`` consecutive failures the breaker opens and
+    rejects requests for ``reset_timeout`` seconds. It then lets a single probe
+    request through; its outcome closes the breaker again or re-opens it. A
+    probe that is released without outcome, or that did not report back
+    within ``reset_timeout``, is replaced by the next request.
+    """
+
+    def __init__(self, failure_threshold=5, reset_timeout=60) -> None:
+        """Initialize the circuit breaker."""
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = BreakerState.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.__probe_started = None
+
+    def allow_request(self):
+        """Return True if a request may be sent now."""
+        if self.state == BreakerState.CLOSED:
+            return True
+
+        now = time.monotonic()
+        if (
+            self.state == BreakerState.OPEN
+            and now - self.opened_at >= self.reset_timeout
+        ):
+            self.state = BreakerState.HALF_OPEN
+            self.__probe_started = None
+
+        if self.state == BreakerState.HALF_OPEN and (
+            self.__probe_started is None
+            or now - self.__probe_started >= self.reset_timeout
+        ):
+            self.__probe_started = now
+            return True
+
+        return False
+
+    def release(self):
+        """Let another request probe after a request ended without outcome."""
+        self.__probe_started = None
+
+    def record_success(self):
+        """Close the breaker after a successful request."""
+        self.state = BreakerState.CLOSED
+        self.failures = 0
+        self.__probe_started = None
+
+    def record_failure(self):
+        """Count a transient failure, opening the breaker when needed."""
+        self.failures += 1
+        self.__probe_started = None
+        if (
+            self.state == BreakerState.HALF_OPEN
+            or self.failures >= self.failure_threshold
+        ):
+            self.state = BreakerState.OPEN
+            self.opened_at = time.monotonic()
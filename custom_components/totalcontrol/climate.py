@@ -8,46 +8,39 @@ from homeassistant.components.climate import (
     HVACMode,
 )
 from homeassistant.const import ATTR_TEMPERATURE, PRECISION_HALVES, UnitOfTemperature
-from homeassistant.helpers.entity import DeviceInfo, HomeAssistant
-from homeassistant.helpers.update_coordinator import (
-    CoordinatorEntity,
-    DataUpdateCoordinator,
-)
+from homeassistant.core import HomeAssistant
 
 from .const import DOMAIN, JsonDataField
+from .coordinator import totalcontrolCoordinator
+from .entity import totalcontrolEntity
 from .totalcontrol import totalcontrolError
 
 _LOGGER = logging.getLogger(__name__)
 
+CLIMATE_REGISTERS = (
+    JsonDataField.MACHINE_STATE,
+    JsonDataField.ROOM_TEMPERATURE,
+    JsonDataField.TARGET_WATER_TEMPERATURE,
+)
+
 
 async def async_setup_entry(hass: HomeAssistant, entry, async_add_entities):
     """Representation of setup entry."""
-    coordinator: DataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id][
+    coordinator: totalcontrolCoordinator = hass.data[DOMAIN][entry.entry_id][
         "coordinator"
     ]
     agua = hass.data[DOMAIN][entry.entry_id]["agua"]
     entities = [totalcontrolWaterDevice(coordinator, device) for device in agua.devices]
-    async_add_entities(entities, True)
+    async_add_entities(entities)
 
 
-class totalcontrolWaterDevice(CoordinatorEntity, ClimateEntity):
+class totalcontrolWaterDevice(totalcontrolEntity, ClimateEntity):
     """Representation of an Extraflame heating device."""
 
     def __init__(self, coordinator, device) -> None:
         """Initialize the thermostat."""
-        CoordinatorEntity.__init__(self, coordinator)
+        totalcontrolEntity.__init__(self, coordinator, device, CLIMATE_REGISTERS)
         self._enable_turn_on_off_backwards_compatibility = False
-        self._device = device
-
-    @property
-    def device_info(self):
-        """Return the device info."""
-        return DeviceInfo(
-            identifiers={(DOMAIN, self._device.id)},
-            name=self._device.name,
-            manufacturer=self._device.manufacturer,
-            model=self._device.codArt,
-        )
 
     @property
     def temperature_unit(self):
@@ -112,7 +105,6 @@ class totalcontrolWaterDevice(CoordinatorEntity, ClimateEntity):
         """Turn device off."""
         try:
             await self._device.set_register_value(JsonDataField.MACHINE_STATE, 0)
-            await self.coordinator.async_request_refresh()
         except (ValueError, totalcontrolError) as err:
             _LOGGER.error("Failed to stop, error: %s", err)
 
@@ -120,7 +112,6 @@ class totalcontrolWaterDevice(CoordinatorEntity, ClimateEntity):
         """Turn device on."""
         try:
             await self._device.set_register_value(JsonDataField.MACHINE_STATE, 1)
-            await self.coordinator.async_request_refresh()
         except (ValueError, totalcontrolError) as err:
             _LOGGER.error("Failed to start, error: %s", err)
 
@@ -158,13 +149,12 @@ class totalcontrolWaterDevice(CoordinatorEntity, ClimateEntity):
             await self._device.set_register_value(
                 JsonDataField.TARGET_WATER_TEMPERATURE, temperature
             )
-            await self.coordinator.async_request_refresh()
         except (ValueError, totalcontrolError) as err:
             _LOGGER.error("Failed to set temperature, error: %s", err)
 
     @property
     def target_temperature_step(self):
         """Return the supported step of target temperature."""
-        return self._device.get_register(JsonDataField.TARGET_WATER_TEMPERATURE).get(
-            "step", 1
+        return self._device.get_register_value_step(
+            JsonDataField.TARGET_WATER_TEMPERATURE
         )
@@ -7,10 +7,30 @@ import voluptuous as vol
 
 from homeassistant import config_entries
 from homeassistant.const import CONF_EMAIL, CONF_PASSWORD
-from homeassistant.core import HomeAssistant
-
-from .const import CONF_UUID, DOMAIN
-from .totalcontrol import totalcontrol, totalcontrolError
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.httpx_client import get_async_client
+
+from .const import (
+    CONF_INTERVAL_BURST,
+    CONF_INTERVAL_OFF,
+    CONF_INTERVAL_TRANSITIONAL,
+    CONF_INTERVAL_WORKING,
+    CONF_MAX_CONCURRENCY,
+    CONF_POLL_MODE,
+    CONF_REQUEST_BURST,
+    CONF_REQUEST_RATE,
+    CONF_STALE_TTL,
+    CONF_TRACE_MODE,
+    CONF_UUID,
+    DOMAIN,
+    POLL_INTERVALS,
+    REQUEST_BURST,
+    REQUEST_RATE,
+    STALE_TTL,
+    PollMode,
+)
+from .coordinator import async_get_store
+from .totalcontrol import DEFAULT_MAX_CONCURRENCY, totalcontrol, totalcontrolError
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -28,6 +48,12 @@ class totalcontrolConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     VERSION = 1
     CONNECTION_CLASS = config_entries.CONN_CLASS_CLOUD_POLL
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry):
+        """Get the options flow for this handler."""
+        return totalcontrolOptionsFlow(config_entry)
+
     def _entry_in_configuration_exists(self, user_input) -> bool:
         """Return True if config already exists in configuration."""
         email = user_input[CONF_EMAIL]
@@ -46,18 +72,25 @@ class totalcontrolConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             if self._entry_in_configuration_exists(user_input):
                 return self.async_abort(reason="device_already_configured")
 
+            gen_uuid = str(uuid.uuid1())
+            agua = totalcontrol(
+                email=email,
+                password=password,
+                unique_id=gen_uuid,
+                http_client=get_async_client(self.hass),
+            )
             try:
-                gen_uuid = str(uuid.uuid1())
-                agua = totalcontrol(
-                    email=email,
-                    password=password,
-                    unique_id=gen_uuid,
-                )
                 await agua.connect()
 
             except totalcontrolError as e:
                 _LOGGER.error("Login error: %s", e)
                 errors["base"] = "login_error"
+            else:
+                # Hand the session and device list over to the entry setup.
+                store = async_get_store(self.hass, gen_uuid)
+                await store.async_save(agua.as_cache())
+            finally:
+                await agua.close()
 
             if "base" not in errors:
                 return self.async_create_entry(
@@ -80,3 +113,57 @@ class totalcontrolConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         return self.async_show_form(
             step_id="user", data_schema=data_schema, errors=errors
         )
+
+
+class totalcontrolOptionsFlow(config_entries.OptionsFlow):
+    """Agua IOT Options Flow handler."""
+
+    def __init__(self, config_entry) -> None:
+        """Initialize the options flow.
+
+        The entry is kept under its own name, Home Assistant only provides
+        config_entry itself from 2024.11 on.
+        """
+        self._entry = config_entry
+
+    async def async_step_init(self, user_input=None):
+        """Manage the polling options."""
+        if user_input is not None:
+            return self.async_create_entry(title="", data=user_input)
+
+        options = self._entry.options
+        schema = {
+            vol.Required(
+                CONF_POLL_MODE, default=options.get(CONF_POLL_MODE, PollMode.DEVICE)
+            ): vol.In([mode.value for mode in PollMode]),
+            vol.Required(
+                CONF_MAX_CONCURRENCY,
+                default=options.get(CONF_MAX_CONCURRENCY, DEFAULT_MAX_CONCURRENCY),
+            ): vol.All(vol.Coerce(int), vol.Range(min=1, max=32)),
+            vol.Required(
+                CONF_STALE_TTL, default=options.get(CONF_STALE_TTL, STALE_TTL)
+            ): vol.All(vol.Coerce(int), vol.Range(min=60, max=86400)),
+            vol.Required(
+                CONF_REQUEST_RATE,
+                default=options.get(CONF_REQUEST_RATE, REQUEST_RATE),
+            ): vol.All(vol.Coerce(float), vol.Range(min=0.1, max=50)),
+            vol.Required(
+                CONF_REQUEST_BURST,
+                default=options.get(CONF_REQUEST_BURST, REQUEST_BURST),
+            ): vol.All(vol.Coerce(int), vol.Range(min=1, max=100)),
+            vol.Required(
+                CONF_TRACE_MODE, default=options.get(CONF_TRACE_MODE, False)
+            ): bool,
+        }
+        for option in (
+            CONF_INTERVAL_TRANSITIONAL,
+            CONF_INTERVAL_WORKING,
+            CONF_INTERVAL_OFF,
+            CONF_INTERVAL_BURST,
+        ):
+            default = options.get(option, POLL_INTERVALS[option])
+            schema[vol.Required(option, default=default)] = vol.All(
+                vol.Coerce(int), vol.Range(min=5, max=3600)
+            )
+
+        return self.async_show_form(step_id="init", data_schema=vol.Schema(schema))
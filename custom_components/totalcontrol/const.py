@@ -1,7 +1,9 @@
 """Agua IOT constants."""
 
+from collections.abc import Callable, Mapping
 from dataclasses import dataclass
 from enum import StrEnum
+from types import MappingProxyType
 
 from homeassistant.components.number import NumberEntityDescription
 from homeassistant.components.sensor import (
@@ -9,7 +11,15 @@ from homeassistant.components.sensor import (
     SensorEntityDescription,
     SensorStateClass,
 )
-from homeassistant.const import Platform, UnitOfTemperature
+from homeassistant.const import (
+    EntityCategory,
+    Platform,
+    UnitOfMass,
+    UnitOfTemperature,
+    UnitOfTime,
+)
+
+from .circuit_breaker import BreakerState
 
 
 @dataclass
@@ -20,6 +30,20 @@ class totalcontrolSensorEntityDescription(SensorEntityDescription):
     raw_value: bool = False
 
 
+@dataclass
+class totalcontrolAccountSensorEntityDescription(SensorEntityDescription):
+    """Account Sensor Entity Description."""
+
+    value_fn: Callable | None = None
+
+
+@dataclass
+class totalcontrolStatisticsSensorEntityDescription(SensorEntityDescription):
+    """Device Statistics Sensor Entity Description."""
+
+    value_fn: Callable | None = None
+
+
 @dataclass
 class totalcontrolNumberEntityDescription(NumberEntityDescription):
     """Number Entity Description."""
@@ -29,6 +53,16 @@ class totalcontrolNumberEntityDescription(NumberEntityDescription):
 
 DOMAIN = "totalcontrol"
 CONF_UUID = "uuid"
+CONF_MAX_CONCURRENCY = "max_concurrency"
+CONF_POLL_MODE = "poll_mode"
+CONF_INTERVAL_OFF = "interval_off"
+CONF_INTERVAL_WORKING = "interval_working"
+CONF_INTERVAL_TRANSITIONAL = "interval_transitional"
+CONF_INTERVAL_BURST = "interval_burst"
+CONF_STALE_TTL = "stale_ttl"
+CONF_REQUEST_RATE = "request_rate"
+CONF_REQUEST_BURST = "request_burst"
+CONF_TRACE_MODE = "trace_mode"
 MANUFACTURER = "Extraflame"
 
 PLATFORMS = [
@@ -38,6 +72,14 @@ PLATFORMS = [
 ]
 
 
+class PollMode(StrEnum):
+    """Available polling modes."""
+
+    DEVICE = "device"
+    LIST = "list"
+    HYBRID = "hybrid"
+
+
 class PayloadField(StrEnum):
     """Available payload datafields."""
 
@@ -86,9 +128,10 @@ REGISTERS = {
             4: "Unknown 4",
             5: "Unknown 5",
             6: "Unknown 6",
-        }
+        },
+        "default": 0,
     },
-    JsonDataField.CREATION_DATE: {},
+    JsonDataField.CREATION_DATE: {"numeric": False},
     JsonDataField.MACHINE_STATE: {
         "parameterId": 0,
         "set_min": 0,
@@ -123,7 +166,123 @@ REGISTERS = {
     },
 }
 
+
+@dataclass(frozen=True, slots=True, eq=False)
+class RegisterDescriptor:
+    """Read-only register definition compiled from REGISTERS."""
+
+    key: str
+    index: int
+    options: Mapping[int, str]
+    reverse_options: Mapping[str, int]
+    parameterId: int | None = None
+    set_min: float | None = None
+    set_max: float | None = None
+    step: float = 1
+    default: object = None
+    numeric: bool = True
+
+    def as_dict(self):
+        """Return the register definition in the REGISTERS format."""
+        register = {}
+        if self.options:
+            register["enc_val"] = dict(self.options)
+        if self.parameterId is not None:
+            register["parameterId"] = self.parameterId
+            register["set_min"] = self.set_min
+            register["set_max"] = self.set_max
+        return register
+
+
+def _compile_registers(registers):
+    """Build the register table once, validating the writable registers."""
+    table = {}
+    for index, (key, register) in enumerate(registers.items()):
+        options = register.get("enc_val", {})
+        parameter_id = register.get("parameterId")
+        if parameter_id is not None and not (
+            isinstance(parameter_id, int)
+            and register["set_min"] <= register["set_max"]
+        ):
+            raise ValueError(f"Invalid writable register definition: {key}")
+
+        table[key] = RegisterDescriptor(
+            key=key,
+            index=index,
+            parameterId=parameter_id,
+            set_min=register.get("set_min"),
+            set_max=register.get("set_max"),
+            step=register.get("step", 1),
+            default=register.get("default"),
+            numeric=register.get("numeric", True),
+            options=MappingProxyType(dict(options)),
+            reverse_options=MappingProxyType(
+                {name: value for value, name in options.items()}
+            ),
+        )
+    return MappingProxyType(table)
+
+
+REGISTER_TABLE = _compile_registers(REGISTERS)
+REGISTER_KEYS = tuple(REGISTER_TABLE)
+
+# Numeric registers kept in the in-memory history of each device.
+HISTORY_REGISTERS = (
+    JsonDataField.ROOM_TEMPERATURE,
+    JsonDataField.WATER_TEMPERATURE,
+    JsonDataField.SMOKE_TEMPERATURE,
+    JsonDataField.POWER,
+    JsonDataField.MACHINE_STATE,
+)
+
+# machineState values with the burner fed, and the ignition state.
+BURNER_STATES = frozenset({2, 3, 4})
+IGNITION_STATE = 2
+# Approximate pellet consumption in kg/h for each power level.
+PELLET_CONSUMPTION_RATES = {1: 0.8, 2: 1.1, 3: 1.4, 4: 1.8, 5: 2.2}
+STATISTICS_MAX_GAP = 900
+# Window of the water heat-up rate in seconds.
+HEATUP_WINDOW = 600
+
+# Order of batched writes, setpoints before switching the stove on or off.
+WRITE_ORDER = (
+    JsonDataField.TARGET_POWER,
+    JsonDataField.TARGET_ROOM_TEMPERATURE,
+    JsonDataField.TARGET_WATER_TEMPERATURE,
+    JsonDataField.MACHINE_STATE,
+)
+
+DATA_STORES = "totalcontrol_stores"
+STORAGE_KEY = "totalcontrol.{}"
+STORAGE_VERSION = 1
+STORAGE_SAVE_DELAY = 60
+
 UPDATE_INTERVAL = 60
+BURST_DURATION = 60
+STALE_TTL = 900
+REQUEST_RATE = 2.0
+REQUEST_BURST = 10
+
+POLL_INTERVALS = {
+    CONF_INTERVAL_OFF: 300,
+    CONF_INTERVAL_WORKING: UPDATE_INTERVAL,
+    CONF_INTERVAL_TRANSITIONAL: 15,
+    CONF_INTERVAL_BURST: 5,
+}
+
+# Poll interval option used for each machineState value.
+MACHINE_STATE_POLL_INTERVALS = {
+    0: CONF_INTERVAL_OFF,
+    1: CONF_INTERVAL_WORKING,
+    2: CONF_INTERVAL_TRANSITIONAL,
+    3: CONF_INTERVAL_TRANSITIONAL,
+    4: CONF_INTERVAL_WORKING,
+    5: CONF_INTERVAL_TRANSITIONAL,
+    6: CONF_INTERVAL_TRANSITIONAL,
+    7: CONF_INTERVAL_TRANSITIONAL,
+    8: CONF_INTERVAL_TRANSITIONAL,
+    9: CONF_INTERVAL_OFF,
+}
 
 SENSORS = (
     totalcontrolSensorEntityDescription(
@@ -167,6 +326,90 @@ SENSORS = (
     ),
 )
 
+STATISTICS_SENSORS = (
+    totalcontrolStatisticsSensorEntityDescription(
+        key="pellet_consumption",
+        name="Pellet consumption",
+        icon="mdi:grain",
+        native_unit_of_measurement=UnitOfMass.KILOGRAMS,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        device_class=SensorDeviceClass.WEIGHT,
+        suggested_display_precision=1,
+        value_fn=lambda device: device.statistics.pellets,
+    ),
+    totalcontrolStatisticsSensorEntityDescription(
+        key="burner_runtime",
+        name="Burner runtime",
+        icon="mdi:timer-outline",
+        native_unit_of_measurement=UnitOfTime.HOURS,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        device_class=SensorDeviceClass.DURATION,
+        suggested_display_precision=1,
+        value_fn=lambda device: device.statistics.runtime / 3600,
+    ),
+    totalcontrolStatisticsSensorEntityDescription(
+        key="ignitions",
+        name="Ignitions",
+        icon="mdi:counter",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda device: device.statistics.ignitions,
+    ),
+    totalcontrolStatisticsSensorEntityDescription(
+        key="water_heatup_rate",
+        name="Water heat-up rate",
+        icon="mdi:thermometer-chevron-up",
+        native_unit_of_measurement="°C/min",
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=2,
+        value_fn=lambda device: device.heatup_rate,
+    ),
+)
+
+ACCOUNT_SENSORS = (
+    totalcontrolAccountSensorEntityDescription(
+        key="circuit_breaker",
+        name="Cloud connection",
+        icon="mdi:cloud-sync",
+        device_class=SensorDeviceClass.ENUM,
+        options=[state.value for state in BreakerState],
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda agua: agua.circuit_breaker.state,
+    ),
+    totalcontrolAccountSensorEntityDescription(
+        key="poll_cycle_duration",
+        name="Poll cycle duration",
+        icon="mdi:timer-outline",
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        device_class=SensorDeviceClass.DURATION,
+        suggested_display_precision=2,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        value_fn=lambda agua: agua.metrics.poll_cycle.last,
+    ),
+    totalcontrolAccountSensorEntityDescription(
+        key="request_latency",
+        name="Request latency",
+        icon="mdi:timer-outline",
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        device_class=SensorDeviceClass.DURATION,
+        suggested_display_precision=2,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        value_fn=lambda agua: agua.metrics.total.latency.mean,
+    ),
+    totalcontrolAccountSensorEntityDescription(
+        key="request_failures",
+        name="Request failures",
+        icon="mdi:cloud-alert",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        entity_registry_enabled_default=False,
+        value_fn=lambda agua: agua.metrics.total.failures,
+    ),
+)
+
 NUMBERS = (
     totalcontrolNumberEntityDescription(
         key=JsonDataField.TARGET_POWER,
@@ -0,0 +1,127 @@
+"""Data update coordinator for total control."""
+
+from datetime import timedelta
+from functools import partial
+import logging
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+
+from .const import (
+    DATA_STORES,
+    STORAGE_KEY,
+    STORAGE_SAVE_DELAY,
+    STORAGE_VERSION,
+    UPDATE_INTERVAL,
+)
+from .totalcontrol import totalcontrol, totalcontrolError
+
+_LOGGER = logging.getLogger(__name__)
+
+MIN_UPDATE_INTERVAL = 1
+
+
+@callback
+def async_get_store(hass: HomeAssistant, unique_id) -> Store:
+    """Return the device cache store of an account, one instance per account.
+
+    Sharing the instance across reloads keeps a delayed save of a previous
+    setup from overwriting newer data.
+    """
+    stores = hass.data.setdefault(DATA_STORES, {})
+    if unique_id not in stores:
+        stores[unique_id] = Store(hass, STORAGE_VERSION, STORAGE_KEY.format(unique_id))
+    return stores[unique_id]
+
+
+class totalcontrolCoordinator(DataUpdateCoordinator):
+    """Coordinate polling of all devices of a total control account.
+
+    The update interval follows the device that is due first, so the
+    coordinator wakes up often while a stove is in a transitional state or
+    was just written to, and rarely while all stoves are off.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, agua: totalcontrol, store: Store | None = None
+    ) -> None:
+        """Initialize the coordinator."""
+        DataUpdateCoordinator.__init__(
+            self,
+            hass,
+            _LOGGER,
+            name="totalcontrol",
+            update_interval=timedelta(seconds=UPDATE_INTERVAL),
+        )
+        self.agua = agua
+        self.store = store
+        self.__unsub_stale_check = None
+        for device in agua.devices:
+            device.add_listener(partial(self._async_device_updated, device))
+        self._async_schedule_stale_check()
+
+    async def _async_update_data(self):
+        """Get the latest data."""
+        try:
+            await self.agua.update()
+        except totalcontrolError as error:
+            raise UpdateFailed(f"Unable to fetch data: {error}") from error
+        finally:
+            self._async_set_next_update_interval()
+            self._async_schedule_stale_check()
+            if self.store is not None:
+                self.store.async_delay_save(self.agua.as_cache, STORAGE_SAVE_DELAY)
+
+    @callback
+    def _async_set_next_update_interval(self):
+        seconds = max(MIN_UPDATE_INTERVAL, self.agua.next_update_in())
+        self.update_interval = timedelta(seconds=seconds)
+
+    @callback
+    def _async_schedule_stale_check(self):
+        """Notify entities when the next available device turns stale.
+
+        Failed refreshes do not call the listeners, so without this check
+        entities would keep their last values through an outage.
+        """
+        self.async_cancel_stale_check()
+        stale_in = [dev.stale_in() for dev in self.agua.devices if dev.available]
+        if stale_in:
+            self.__unsub_stale_check = async_call_later(
+                self.hass, min(stale_in), self._async_handle_stale
+            )
+
+    @callback
+    def _async_handle_stale(self, _now):
+        self.__unsub_stale_check = None
+        for device in self.agua.devices:
+            if not device.available:
+                self.async_update_device_listeners(device)
+        self._async_schedule_stale_check()
+
+    @callback
+    def async_cancel_stale_check(self):
+        """Cancel the scheduled staleness check."""
+        if self.__unsub_stale_check is not None:
+            self.__unsub_stale_check()
+            self.__unsub_stale_check = None
+
+    @callback
+    def _async_device_updated(self, device):
+        """Handle a device update outside of the polling cycle."""
+        self.async_update_device_listeners(device)
+
+        # A write shortens the poll interval of the device, poll it sooner.
+        scheduled = self.update_interval
+        self._async_set_next_update_interval()
+        if self._listeners and self.update_interval < scheduled:
+            self._schedule_refresh()
+
+    @callback
+    def async_update_device_listeners(self, device):
+        """Notify the entities of a single device."""
+        for update_callback, context in list(self._listeners.values()):
+            if context == device.mac:
+                update_callback()
@@ -9,11 +9,12 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_EMAIL, CONF_PASSWORD
 from homeassistant.core import HomeAssistant
 
-from .const import DOMAIN
+from .const import DOMAIN, PayloadField
 
 TO_REDACT = {
     CONF_PASSWORD,
     CONF_EMAIL,
+    PayloadField.TOKEN,
 }
 
 
@@ -32,4 +33,7 @@ async def async_get_config_entry_diagnostics(
     return {
         "entry": async_redact_data(entry.as_dict(), TO_REDACT),
         "devices": devices,
+        "circuit_breaker": agua.circuit_breaker.state,
+        "metrics": agua.metrics.as_dict(),
+        "requests": async_redact_data(agua.trace.as_list(), TO_REDACT),
     }
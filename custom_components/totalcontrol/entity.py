@@ -0,0 +1,71 @@
+"""Base entity for total control."""
+
+from homeassistant.core import callback
+from homeassistant.helpers.device_registry import DeviceEntryType
+from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .const import DOMAIN, MANUFACTURER
+
+
+class totalcontrolEntity(CoordinatorEntity):
+    """Representation of an total control device entity."""
+
+    def __init__(self, coordinator, device, registers) -> None:
+        """Initialize the entity, listening to updates of its device only."""
+        CoordinatorEntity.__init__(self, coordinator, context=device.mac)
+        self._device = device
+        self._registers = tuple(registers)
+        self._revision = device.revision
+        self._last_available = None
+
+    @property
+    def available(self):
+        """Return True while the device snapshot is not stale.
+
+        Devices keep serving their last snapshot while they, or the whole
+        account, fail to refresh.
+        """
+        return self._device.available
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write state only when one of the entity registers changed."""
+        available = self.available
+        if available == self._last_available and not self._device.changed_since(
+            self._revision, self._registers
+        ):
+            return
+
+        self._last_available = available
+        self._revision = self._device.revision
+        self.async_write_ha_state()
+
+    @property
+    def device_info(self):
+        """Return the device info."""
+        return DeviceInfo(
+            identifiers={(DOMAIN, self._device.id)},
+            name=self._device.name,
+            manufacturer=self._device.manufacturer,
+            model=self._device.codArt,
+        )
+
+
+class totalcontrolAccountEntity(CoordinatorEntity):
+    """Representation of an total control account entity."""
+
+    def __init__(self, coordinator, agua) -> None:
+        """Initialize the entity, updated on every polling cycle."""
+        CoordinatorEntity.__init__(self, coordinator)
+        self._agua = agua
+
+    @property
+    def device_info(self):
+        """Return the device info of the cloud account."""
+        return DeviceInfo(
+            identifiers={(DOMAIN, self._agua.unique_id)},
+            name=f"{MANUFACTURER} cloud",
+            manufacturer=MANUFACTURER,
+            entry_type=DeviceEntryType.SERVICE,
+        )
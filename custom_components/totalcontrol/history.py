@@ -0,0 +1,95 @@
+"""In-memory register history of a total control device."""
+
+from array import array
+import math
+import time
+
+from .const import REGISTER_TABLE
+
+DEFAULT_HISTORY_SIZE = 720
+
+
+class RegisterHistory:
+    """Fixed-size ring buffer of timestamped samples of numeric registers.
+
+    Samples are stored in preallocated ``array('d')`` columns, one per
+    register, so memory per device is constant. Missing values are NaN and
+    are skipped by the window queries.
+    """
+
+    def __init__(self, keys, size=DEFAULT_HISTORY_SIZE) -> None:
+        """Initialize the history for the registers ``keys``."""
+        self.keys = tuple(keys)
+        self.size = size
+        self.__indexes = [REGISTER_TABLE[key].index for key in self.keys]
+        self.__times = array("d", bytes(8 * size))
+        self.__columns = {key: array("d", bytes(8 * size)) for key in self.keys}
+        self.__next = 0
+        self.__count = 0
+
+    def __len__(self) -> int:
+        """Return the number of samples held."""
+        return self.__count
+
+    def append(self, timestamp, values):
+        """Record a register snapshot, ``values`` indexed by register index."""
+        slot = self.__next
+        self.__times[slot] = timestamp
+        for key, index in zip(self.keys, self.__indexes):
+            value = values[index]
+            self.__columns[key][slot] = (
+                value if isinstance(value, (int, float)) else math.nan
+            )
+        self.__next = (slot + 1) % self.size
+        self.__count = min(self.__count + 1, self.size)
+
+    def window(self, key, seconds, now=None):
+        """Return the (timestamp, value) samples of the last ``seconds``."""
+        if now is None:
+            now = time.monotonic()
+        cutoff = now - seconds
+        times = self.__times
+        column = self.__columns[key]
+        samples = []
+        slot = self.__next
+        for _ in range(self.__count):
+            slot = (slot - 1) % self.size
+            if times[slot] < cutoff:
+                break
+            if not math.isnan(column[slot]):
+                samples.append((times[slot], column[slot]))
+        samples.reverse()
+        return samples
+
+    def minimum(self, key, seconds, now=None):
+        """Return the lowest value of the window, or None without samples."""
+        samples = self.window(key, seconds, now)
+        return min(value for _, value in samples) if samples else None
+
+    def maximum(self, key, seconds, now=None):
+        """Return the highest value of the window, or None without samples."""
+        samples = self.window(key, seconds, now)
+        return max(value for _, value in samples) if samples else None
+
+    def mean(self, key, seconds, now=None):
+        """Return the mean value of the window, or None without samples."""
+        samples = self.window(key, seconds, now)
+        if not samples:
+            return None
+        return math.fsum(value for _, value in samples) / len(samples)
+
+    def slope(self, key, seconds, now=None):
+        """Return the least-squares slope of the window in units per second.
+
+        Returns None with fewer than two samples or a zero time span.
+        """
+        samples = self.window(key, seconds, now)
+        if len(samples) < 2:
+            return None
+        count = len(samples)
+        mean_t = math.fsum(t for t, _ in samples) / count
+        mean_v = math.fsum(v for _, v in samples) / count
+        var_t = math.fsum((t - mean_t) ** 2 for t, _ in samples)
+        if not var_t:
+            return None
+        return math.fsum((t - mean_t) * (v - mean_v) for t, v in samples) / var_t
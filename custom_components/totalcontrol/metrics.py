@@ -0,0 +1,138 @@
+"""Request metrics for the total control cloud."""
+
+from bisect import bisect_left
+
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class LatencyHistogram:
+    """Fixed bucket histogram of durations in seconds."""
+
+    __slots__ = ("counts", "count", "total", "maximum", "last")
+
+    def __init__(self) -> None:
+        """Initialize an empty histogram."""
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.maximum = 0.0
+        self.last = None
+
+    def observe(self, seconds):
+        """Add a duration."""
+        self.counts[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.last = seconds
+        if seconds > self.maximum:
+            self.maximum = seconds
+
+    @property
+    def mean(self):
+        """Return the mean duration, None without observations."""
+        return self.total / self.count if self.count else None
+
+    def as_dict(self):
+        """Return the histogram as a dict."""
+        buckets = {
+            f"le_{bound}": count for bound, count in zip(LATENCY_BUCKETS, self.counts)
+        }
+        buckets["le_inf"] = self.counts[-1]
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "max": self.maximum,
+            "last": self.last,
+            "buckets": buckets,
+        }
+
+
+class RequestMetrics:
+    """Counters and latency of requests to an endpoint or for a device."""
+
+    __slots__ = (
+        "latency",
+        "successes",
+        "failures",
+        "retries",
+        "rejected",
+        "bytes_received",
+    )
+
+    def __init__(self) -> None:
+        """Initialize empty metrics."""
+        self.latency = LatencyHistogram()
+        self.successes = 0
+        self.failures = 0
+        self.retries = 0
+        self.rejected = 0
+        self.bytes_received = 0
+
+    def as_dict(self):
+        """Return the metrics as a dict."""
+        return {
+            "latency": self.latency.as_dict(),
+            "successes": self.successes,
+            "failures": self.failures,
+            "retries": self.retries,
+            "rejected": self.rejected,
+            "bytes_received": self.bytes_received,
+        }
+
+
+class Metrics:
+    """Request metrics per endpoint and per device, and poll cycle durations."""
+
+    def __init__(self) -> None:
+        """Initialize empty metrics."""
+        self.total = RequestMetrics()
+        self.endpoints = {}
+        self.devices = {}
+        self.poll_cycle = LatencyHistogram()
+
+    def __targets(self, endpoint, mac):
+        targets = [self.total]
+        metrics = self.endpoints.get(endpoint)
+        if metrics is None:
+            metrics = self.endpoints[endpoint] = RequestMetrics()
+        targets.append(metrics)
+        if mac is not None:
+            metrics = self.devices.get(mac)
+            if metrics is None:
+                metrics = self.devices[mac] = RequestMetrics()
+            targets.append(metrics)
+        return targets
+
+    def record_attempt(self, endpoint, mac, seconds, size):
+        """Record the latency and response size of a single HTTP attempt."""
+        for metrics in self.__targets(endpoint, mac):
+            metrics.latency.observe(seconds)
+            metrics.bytes_received += size
+
+    def record_result(self, endpoint, mac, success, retries):
+        """Record the outcome of a request including its retries."""
+        for metrics in self.__targets(endpoint, mac):
+            metrics.retries += retries
+            if success:
+                metrics.successes += 1
+            else:
+                metrics.failures += 1
+
+    def record_rejected(self, endpoint, mac):
+        """Record a request rejected by the circuit breaker."""
+        for metrics in self.__targets(endpoint, mac):
+            metrics.rejected += 1
+
+    def as_dict(self):
+        """Return all metrics as a dict."""
+        return {
+            "total": self.total.as_dict(),
+            "poll_cycle": self.poll_cycle.as_dict(),
+            "endpoints": {
+                endpoint: metrics.as_dict()
+                for endpoint, metrics in self.endpoints.items()
+            },
+            "devices": {
+                mac: metrics.as_dict() for mac, metrics in self.devices.items()
+            },
+        }
@@ -4,13 +4,10 @@ import logging
 
 from homeassistant.components.number import NumberEntity
 from homeassistant.core import HomeAssistant
-from homeassistant.helpers.entity import DeviceInfo
-from homeassistant.helpers.update_coordinator import (
-    CoordinatorEntity,
-    DataUpdateCoordinator,
-)
 
 from .const import DOMAIN, NUMBERS
+from .coordinator import totalcontrolCoordinator
+from .entity import totalcontrolEntity
 from .totalcontrol import totalcontrolError
 
 _LOGGER = logging.getLogger(__name__)
@@ -18,7 +15,7 @@ _LOGGER = logging.getLogger(__name__)
 
 async def async_setup_entry(hass: HomeAssistant, entry, async_add_entities):
     """Representation of setup entry."""
-    coordinator: DataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id][
+    coordinator: totalcontrolCoordinator = hass.data[DOMAIN][entry.entry_id][
         "coordinator"
     ]
     agua = hass.data[DOMAIN][entry.entry_id]["agua"]
@@ -30,16 +27,15 @@ async def async_setup_entry(hass: HomeAssistant, entry, async_add_entities):
         if number.key in device.registers and (number.force_enabled)
     ]
 
-    async_add_entities(numbers, True)
+    async_add_entities(numbers)
 
 
-class totalcontrolHeatingNumber(CoordinatorEntity, NumberEntity):
+class totalcontrolHeatingNumber(totalcontrolEntity, NumberEntity):
     """Representation of an total control number entity."""
 
     def __init__(self, coordinator, device, description) -> None:
         """Initialize the thermostat."""
-        CoordinatorEntity.__init__(self, coordinator)
-        self._device = device
+        totalcontrolEntity.__init__(self, coordinator, device, (description.key,))
         self.entity_description = description
 
     @property
@@ -52,16 +48,6 @@ class totalcontrolHeatingNumber(CoordinatorEntity, NumberEntity):
         """Return the name of the device, if any."""
         return f"{self._device.name} {self.entity_description.name}"
 
-    @property
-    def device_info(self):
-        """Return the device info."""
-        return DeviceInfo(
-            identifiers={(DOMAIN, self._device.id)},
-            name=self._device.name,
-            manufacturer=self._device.manufacturer,
-            model=self._device.codArt,
-        )
-
     @property
     def native_value(self):
         """Return the state of the sensor."""
@@ -81,6 +67,5 @@ class totalcontrolHeatingNumber(CoordinatorEntity, NumberEntity):
         """Set value of the sensor."""
         try:
             await self._device.set_register_value(self.entity_description.key, value)
-            await self.coordinator.async_request_refresh()
         except (ValueError, totalcontrolError) as err:
             _LOGGER.error("Failed to set value, error: %s", err)
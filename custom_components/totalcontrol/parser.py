@@ -0,0 +1,55 @@
+"""Parsing of total control cloud responses."""
+
+from json import JSONDecodeError
+
+from .const import REGISTER_TABLE, JsonDataField
+
+try:
+    from orjson import loads
+except ImportError:
+    from json import loads
+
+__all__ = ["JSONDecodeError", "loads", "parse_device_list", "parse_state"]
+
+
+def parse_state(data, previous):
+    """Extract the known registers of a stove state into a value list.
+
+    Registers missing from ``data`` keep their ``previous`` value, or fall
+    back to the register default. Unknown fields are ignored. Raises
+    ValueError for a malformed state, leaving ``previous`` untouched.
+    """
+    if not isinstance(data, dict):
+        raise ValueError(f"Expected a stove state object, got {type(data).__name__}")
+
+    values = list(previous)
+    for key, register in REGISTER_TABLE.items():
+        value = data.get(key)
+        if value is None:
+            if values[register.index] is None:
+                values[register.index] = register.default
+            continue
+        if register.numeric and (
+            isinstance(value, bool) or not isinstance(value, (int, float))
+        ):
+            raise ValueError(f"Invalid value for {key}: {value!r}")
+        values[register.index] = value
+    return values
+
+
+def parse_device_list(data):
+    """Return the well-formed entries of a stove list.
+
+    Entries that are not objects or lack a serial or MAC are skipped. Raises
+    ValueError when ``data`` is not a list.
+    """
+    if not isinstance(data, list):
+        raise ValueError(f"Expected a stove list, got {type(data).__name__}")
+
+    return [
+        dev
+        for dev in data
+        if isinstance(dev, dict)
+        and dev.get(JsonDataField.SERIAL) is not None
+        and dev.get(JsonDataField.MAC) is not None
+    ]
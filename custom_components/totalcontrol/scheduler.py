@@ -0,0 +1,126 @@
+"""Account-wide request scheduling for the total control cloud."""
+
+import asyncio
+from enum import IntEnum
+import heapq
+import itertools
+import time
+
+from .const import REQUEST_BURST, REQUEST_RATE
+
+
+class RequestPriority(IntEnum):
+    """Request priorities, lower values are served first."""
+
+    WRITE = 0
+    CONFIRM = 1
+    POLL = 2
+
+
+class RequestScheduler:
+    """Token bucket limiting the request rate to a host.
+
+    Requests wait for a token when the bucket is empty. Waiting requests are
+    served by priority, so user writes do not queue behind background polls.
+    """
+
+    def __init__(self, rate=REQUEST_RATE, burst=REQUEST_BURST) -> None:
+        """Initialize the scheduler with a rate in requests per second."""
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.__updated = time.monotonic()
+        self.__waiters = []
+        self.__counter = itertools.count()
+        self.__wakeup = None
+        self.__defaults = (rate, burst)
+        self.__limits = {}
+
+    def configure(self, rate, burst):
+        """Change the rate and burst size."""
+        self.__refill()
+        self.rate = rate
+        self.burst = burst
+        self.tokens = min(self.tokens, float(burst))
+
+    def set_limits(self, owner, rate=None, burst=None):
+        """Set the limits requested by owner, e.g. a config entry.
+
+        Owners sharing the scheduler get the lowest requested rate and burst,
+        limits not given by any owner keep the scheduler defaults.
+        """
+        self.__limits[owner] = (rate, burst)
+        self.__apply_limits()
+
+    def remove_limits(self, owner):
+        """Drop the limits requested by owner."""
+        if self.__limits.pop(owner, None) is not None:
+            self.__apply_limits()
+
+    def __apply_limits(self):
+        rates = [rate for rate, _ in self.__limits.values() if rate is not None]
+        bursts = [burst for _, burst in self.__limits.values() if burst is not None]
+        default_rate, default_burst = self.__defaults
+        self.configure(
+            min(rates, default=default_rate), min(bursts, default=default_burst)
+        )
+
+    async def acquire(self, priority=RequestPriority.POLL):
+        """Wait until a request of the given priority may be sent."""
+        self.__refill()
+        if not self.__waiters and self.tokens >= 1:
+            self.tokens -= 1
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self.__waiters, (priority, next(self.__counter), future))
+        self.__schedule_wakeup()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # The token was granted after all, give it back.
+                self.tokens += 1
+            raise
+
+    def __refill(self):
+        now = time.monotonic()
+        self.tokens = min(
+            float(self.burst), self.tokens + (now - self.__updated) * self.rate
+        )
+        self.__updated = now
+
+    def __schedule_wakeup(self):
+        if self.__wakeup is not None or not self.__waiters:
+            return
+        delay = max(0.0, (1 - self.tokens) / self.rate)
+        self.__wakeup = asyncio.get_running_loop().call_later(delay, self.__dispatch)
+
+    def __dispatch(self):
+        self.__wakeup = None
+        self.__refill()
+        while self.__waiters and self.tokens >= 1:
+            _, _, future = heapq.heappop(self.__waiters)
+            if future.done():
+                continue
+            self.tokens -= 1
+            future.set_result(None)
+        self.__schedule_wakeup()
+
+
+_SCHEDULERS = {}
+
+
+def get_scheduler(host, owner=None, rate=None, burst=None):
+    """Return the scheduler shared by all accounts of a host.
+
+    An owner passing an explicit rate or burst registers it as its limits,
+    see RequestScheduler.set_limits. Without them the scheduler is returned
+    unchanged.
+    """
+    scheduler = _SCHEDULERS.get(host)
+    if scheduler is None:
+        scheduler = _SCHEDULERS[host] = RequestScheduler()
+    if owner is not None and (rate is not None or burst is not None):
+        scheduler.set_limits(owner, rate, burst)
+    return scheduler
@@ -1,19 +1,23 @@
 """Support for total control sensor entity."""
 
 from homeassistant.components.sensor import SensorEntity
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.entity import DeviceInfo
-from homeassistant.helpers.update_coordinator import (
-    CoordinatorEntity,
-    DataUpdateCoordinator,
-)
+from homeassistant.core import HomeAssistant, callback
 
-from .const import DOMAIN, SENSORS
+from .const import (
+    ACCOUNT_SENSORS,
+    DOMAIN,
+    MANUFACTURER,
+    SENSORS,
+    STATISTICS_SENSORS,
+    JsonDataField,
+)
+from .coordinator import totalcontrolCoordinator
+from .entity import totalcontrolAccountEntity, totalcontrolEntity
 
 
 async def async_setup_entry(hass: HomeAssistant, entry, async_add_entities) -> None:
     """Representation of setup entry."""
-    coordinator: DataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id][
+    coordinator: totalcontrolCoordinator = hass.data[DOMAIN][entry.entry_id][
         "coordinator"
     ]
     agua = hass.data[DOMAIN][entry.entry_id]["agua"]
@@ -23,17 +27,25 @@ async def async_setup_entry(hass: HomeAssistant, entry, async_add_entities) -> N
         for device in agua.devices
         for sensor in SENSORS
     ]
+    sensors.extend(
+        totalcontrolStatisticsSensor(coordinator, device, sensor)
+        for device in agua.devices
+        for sensor in STATISTICS_SENSORS
+    )
+    sensors.extend(
+        totalcontrolAccountSensor(coordinator, agua, sensor)
+        for sensor in ACCOUNT_SENSORS
+    )
 
-    async_add_entities(sensors, True)
+    async_add_entities(sensors)
 
 
-class totalcontrolHeatingSensor(CoordinatorEntity, SensorEntity):
+class totalcontrolHeatingSensor(totalcontrolEntity, SensorEntity):
     """Representation of an total control sensor entity."""
 
     def __init__(self, coordinator, device, description) -> None:
         """Initialize the thermostat."""
-        CoordinatorEntity.__init__(self, coordinator)
-        self._device = device
+        totalcontrolEntity.__init__(self, coordinator, device, (description.key,))
         self.entity_description = description
 
     @property
@@ -46,16 +58,6 @@ class totalcontrolHeatingSensor(CoordinatorEntity, SensorEntity):
         """Return the name of the device, if any."""
         return f"{self._device.name} {self.entity_description.name}"
 
-    @property
-    def device_info(self):
-        """Return the device info."""
-        return DeviceInfo(
-            identifiers={(DOMAIN, self._device.id)},
-            name=self._device.name,
-            manufacturer=self._device.manufacturer,
-            model=self._device.codArt,
-        )
-
     @property
     def native_value(self):
         """Return the state of the sensor."""
@@ -63,3 +65,69 @@ class totalcontrolHeatingSensor(CoordinatorEntity, SensorEntity):
             return self._device.get_register_value(self.entity_description.key)
 
         return self._device.get_register_value_description(self.entity_description.key)
+
+
+class totalcontrolStatisticsSensor(totalcontrolEntity, SensorEntity):
+    """Representation of a statistic derived from the polling stream."""
+
+    def __init__(self, coordinator, device, description) -> None:
+        """Initialize the sensor."""
+        totalcontrolEntity.__init__(
+            self,
+            coordinator,
+            device,
+            (JsonDataField.MACHINE_STATE, JsonDataField.WATER_TEMPERATURE),
+        )
+        self.entity_description = description
+        self._last_value = None
+
+    @property
+    def unique_id(self):
+        """Return a unique ID."""
+        return f"{self._device.id}_{self.entity_description.key}"
+
+    @property
+    def name(self):
+        """Return the name of the sensor."""
+        return f"{self._device.name} {self.entity_description.name}"
+
+    @property
+    def native_value(self):
+        """Return the state of the sensor."""
+        return self.entity_description.value_fn(self._device)
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write state when the statistic moved, not only on register changes."""
+        value = self.native_value
+        if value != self._last_value:
+            self._last_value = value
+            self._last_available = self.available
+            self._revision = self._device.revision
+            self.async_write_ha_state()
+            return
+        totalcontrolEntity._handle_coordinator_update(self)
+
+
+class totalcontrolAccountSensor(totalcontrolAccountEntity, SensorEntity):
+    """Representation of an total control account diagnostic sensor."""
+
+    def __init__(self, coordinator, agua, description) -> None:
+        """Initialize the sensor."""
+        totalcontrolAccountEntity.__init__(self, coordinator, agua)
+        self.entity_description = description
+
+    @property
+    def unique_id(self):
+        """Return a unique ID."""
+        return f"{self._agua.unique_id}_{self.entity_description.key}"
+
+    @property
+    def name(self):
+        """Return the name of the sensor."""
+        return f"{MANUFACTURER} cloud {self.entity_description.name}"
+
+    @property
+    def native_value(self):
+        """Return the state of the sensor."""
+        return self.entity_description.value_fn(self._agua)
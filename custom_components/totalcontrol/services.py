@@ -0,0 +1,141 @@
+"""Services of the total control integration."""
+
+import asyncio
+
+import voluptuous as vol
+
+from homeassistant.const import ATTR_DEVICE_ID
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+)
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from homeassistant.helpers import config_validation as cv, device_registry as dr
+
+from .const import DOMAIN
+from .totalcontrol import totalcontrolError, validate_write
+
+SERVICE_SET_REGISTERS = "set_registers"
+SERVICE_BULK_SET_REGISTER = "bulk_set_register"
+ATTR_REGISTERS = "registers"
+ATTR_REGISTER = "register"
+ATTR_VALUE = "value"
+ATTR_ALL = "all"
+ATTR_CODART = "codart"
+SELECTION = "selection"
+
+SET_REGISTERS_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_DEVICE_ID): cv.string,
+        vol.Required(ATTR_REGISTERS): vol.All(
+            {cv.string: vol.Any(vol.Coerce(float), cv.string)}, vol.Length(min=1)
+        ),
+    }
+)
+
+BULK_SET_REGISTER_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            vol.Required(ATTR_REGISTER): cv.string,
+            vol.Required(ATTR_VALUE): vol.Any(vol.Coerce(float), cv.string),
+            vol.Exclusive(ATTR_ALL, SELECTION): vol.IsTrue(),
+            vol.Exclusive(ATTR_CODART, SELECTION): vol.All(
+                cv.ensure_list, [cv.string]
+            ),
+            vol.Exclusive(ATTR_DEVICE_ID, SELECTION): vol.All(
+                cv.ensure_list, [cv.string]
+            ),
+        }
+    ),
+    cv.has_at_least_one_key(ATTR_ALL, ATTR_CODART, ATTR_DEVICE_ID),
+)
+
+
+def _get_device(hass: HomeAssistant, device_id):
+    """Return the total control device of a device registry id."""
+    device_entry = dr.async_get(hass).async_get(device_id)
+    if device_entry is not None:
+        serials = {
+            identifier
+            for domain, identifier in device_entry.identifiers
+            if domain == DOMAIN
+        }
+        for data in hass.data.get(DOMAIN, {}).values():
+            for device in data["agua"].devices:
+                if device.id in serials:
+                    return device
+
+    raise ServiceValidationError(f"Unknown total control device: {device_id}")
+
+
+async def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the total control services."""
+
+    async def async_set_registers(call: ServiceCall) -> None:
+        """Write several registers of a device in one batch."""
+        device = _get_device(hass, call.data[ATTR_DEVICE_ID])
+        try:
+            await device.apply_registers(call.data[ATTR_REGISTERS])
+        except ValueError as error:
+            raise ServiceValidationError(str(error)) from error
+        except totalcontrolError as error:
+            raise HomeAssistantError(str(error)) from error
+
+    async def async_bulk_set_register(call: ServiceCall) -> ServiceResponse:
+        """Write one register of a selection of devices across all accounts."""
+        registers = {call.data[ATTR_REGISTER]: call.data[ATTR_VALUE]}
+        try:
+            validate_write(call.data[ATTR_REGISTER], call.data[ATTR_VALUE])
+        except ValueError as error:
+            raise ServiceValidationError(str(error)) from error
+
+        if ATTR_DEVICE_ID in call.data:
+            selected = {
+                _get_device(hass, device_id) for device_id in call.data[ATTR_DEVICE_ID]
+            }
+        else:
+            codarts = call.data.get(ATTR_CODART)
+            selected = {
+                device
+                for data in hass.data.get(DOMAIN, {}).values()
+                for device in data["agua"].devices
+                if codarts is None or device.codArt in codarts
+            }
+
+        batches = [
+            (data, [device for device in data["agua"].devices if device in selected])
+            for data in hass.data.get(DOMAIN, {}).values()
+        ]
+        batches = [(data, devices) for data, devices in batches if devices]
+        results = await asyncio.gather(
+            *(
+                data["agua"].apply_registers(devices, registers)
+                for data, devices in batches
+            )
+        )
+
+        response = {}
+        for (data, _), result in zip(batches, results):
+            data["coordinator"].async_update_listeners()
+            for device, outcome in result.items():
+                failed = isinstance(outcome, Exception)
+                response[device.id] = {
+                    "name": device.name,
+                    "success": not failed,
+                    "error": str(outcome) if failed else None,
+                    "written": [] if failed else [str(key) for key in outcome],
+                }
+        return {"devices": response}
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_SET_REGISTERS, async_set_registers, SET_REGISTERS_SCHEMA
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_BULK_SET_REGISTER,
+        async_bulk_set_register,
+        BULK_SET_REGISTER_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
@@ -0,0 +1,64 @@
+"""Running statistics derived from the polling stream of a device."""
+
+from .const import (
+    BURNER_STATES,
+    IGNITION_STATE,
+    PELLET_CONSUMPTION_RATES,
+    REGISTER_TABLE,
+    STATISTICS_MAX_GAP,
+    JsonDataField,
+)
+
+_MACHINE_STATE = REGISTER_TABLE[JsonDataField.MACHINE_STATE].index
+_POWER = REGISTER_TABLE[JsonDataField.POWER].index
+_TARGET_POWER = REGISTER_TABLE[JsonDataField.TARGET_POWER].index
+
+
+class DeviceStatistics:
+    """Burner runtime, ignitions and pellet consumption.
+
+    Every sample updates the aggregates in constant time. Intervals longer
+    than STATISTICS_MAX_GAP, e.g. while the cloud was unreachable, are not
+    accounted for.
+    """
+
+    def __init__(self, cache=None) -> None:
+        """Initialize the statistics, restoring them from ``cache``."""
+        cache = cache or {}
+        self.pellets = float(cache.get("pellets", 0.0))
+        self.runtime = float(cache.get("runtime", 0.0))
+        self.ignitions = int(cache.get("ignitions", 0))
+        self.__last_time = None
+        self.__last_state = None
+        self.__last_rate = 0.0
+
+    def as_cache(self):
+        """Return the aggregates for storage."""
+        return {
+            "pellets": self.pellets,
+            "runtime": self.runtime,
+            "ignitions": self.ignitions,
+        }
+
+    def update(self, timestamp, values):
+        """Account for the interval up to a new sample of register ``values``."""
+        state = values[_MACHINE_STATE]
+        power = values[_POWER]
+        if power not in PELLET_CONSUMPTION_RATES:
+            power = values[_TARGET_POWER]
+
+        if self.__last_time is not None:
+            elapsed = timestamp - self.__last_time
+            if 0 < elapsed <= STATISTICS_MAX_GAP:
+                if self.__last_state in BURNER_STATES:
+                    self.runtime += elapsed
+                    self.pellets += self.__last_rate * elapsed / 3600
+            if state == IGNITION_STATE and self.__last_state not in (
+                None,
+                IGNITION_STATE,
+            ):
+                self.ignitions += 1
+
+        self.__last_time = timestamp
+        self.__last_state = state
+        self.__last_rate = PELLET_CONSUMPTION_RATES.get(power, 0.0)
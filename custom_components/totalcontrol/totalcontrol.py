@@ -1,11 +1,39 @@
 """total control provides controlling heating devices connected via total control application."""
 
-from json import JSONDecodeError
+import asyncio
+from importlib.util import find_spec
 import logging
+import random
+import time
+from urllib.parse import urlsplit
+import zlib
 
 import httpx
 
-from .const import MANUFACTURER, REGISTERS, JsonDataField, PayloadField
+from .circuit_breaker import CircuitBreaker
+from .const import (
+    BURST_DURATION,
+    CONF_INTERVAL_BURST,
+    CONF_INTERVAL_WORKING,
+    HEATUP_WINDOW,
+    HISTORY_REGISTERS,
+    MACHINE_STATE_POLL_INTERVALS,
+    MANUFACTURER,
+    POLL_INTERVALS,
+    REGISTER_KEYS,
+    REGISTER_TABLE,
+    STALE_TTL,
+    WRITE_ORDER,
+    JsonDataField,
+    PayloadField,
+    PollMode,
+)
+from .history import RegisterHistory
+from .metrics import Metrics
+from .parser import JSONDecodeError, loads, parse_device_list, parse_state
+from .scheduler import RequestPriority, get_scheduler
+from .stats import DeviceStatistics
+from .trace import LazyBody, LogSampler, RequestTrace
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -14,7 +42,25 @@ API_PATH_LOGIN = "/frontend/index_do.jsp"
 API_PATH_DEVICE_LIST = "/api/stove-list.jsp"
 API_PATH_DEVICE_INFO = "/api/stove-get-state.jsp"
 API_PATH_DEVICE_WRITING = "/api/stove-set-parameter.jsp"
-DEFAULT_TIMEOUT_VALUE = 500
+RESULT_CODE_INVALID_TOKEN = 1
+DEFAULT_TIMEOUT = httpx.Timeout(10.0, connect=10.0, read=30.0, pool=10.0)
+DEFAULT_CYCLE_TIMEOUT = 45
+DEFAULT_MAX_CONCURRENCY = 4
+DEFAULT_LIMITS = httpx.Limits(
+    max_connections=10, max_keepalive_connections=5, keepalive_expiry=30.0
+)
+HTTP2_AVAILABLE = find_spec("h2") is not None
+DEFAULT_TOKEN_LIFETIME = 3600
+CONFIRM_INITIAL_DELAY = 2
+CONFIRM_MAX_DELAY = 8
+CONFIRM_TIMEOUT = 30
+WRITE_DEBOUNCE = 0.5
+POLL_JITTER = 0.05
+RETRY_INITIAL_DELAY = 15
+RETRY_MAX_DELAY = 300
+REQUEST_RETRIES = 2
+REQUEST_BACKOFF_BASE = 0.5
+REQUEST_BACKOFF_MAX = 4
 
 HEADER_ACCEPT = "application/json"
 HEADER_CONTENT_TYPE = "application/json"
@@ -26,6 +72,26 @@ HEADER = {
 }
 
 
+def validate_write(key, value):
+    """Return the register and integer value of a write, or raise ValueError.
+
+    Option names are accepted for registers with options.
+    """
+    register = REGISTER_TABLE.get(key)
+    if register is None or register.parameterId is None:
+        raise ValueError(f"Register is not writable: {key}")
+    value = register.reverse_options.get(value, value)
+    set_min = register.set_min
+    set_max = register.set_max
+    try:
+        number = float(value)
+    except (TypeError, ValueError) as error:
+        raise ValueError(f"Invalid value for {key}: {value}") from error
+    if number < set_min or number > set_max:
+        raise ValueError(f"Value must be between {set_min} and {set_max}: {value}")
+    return register, int(number)
+
+
 class totalcontrol:
     """Manage extraflame heating device."""
 
@@ -34,22 +100,83 @@ class totalcontrol:
         email,
         password,
         unique_id,
+        max_concurrency=DEFAULT_MAX_CONCURRENCY,
+        poll_mode=PollMode.DEVICE,
+        token_lifetime=DEFAULT_TOKEN_LIFETIME,
+        poll_intervals=None,
+        http_client=None,
+        cycle_timeout=DEFAULT_CYCLE_TIMEOUT,
+        stale_ttl=STALE_TTL,
+        scheduler=None,
+        trace_mode=False,
     ) -> None:
-        """Initialize the total control."""
+        """Initialize the total control.
+
+        A shared ``http_client`` is used as is and never closed, otherwise a
+        pooled client owned by this instance is created and closed by close().
+        Requests are rate limited by ``scheduler``, by default the scheduler
+        shared by all accounts of the API host. With ``trace_mode`` the full,
+        redacted request and response of every exchange is logged at debug
+        level, otherwise only a sampled one-line summary is.
+        """
         self.email = email
         self.password = password
         self.unique_id = unique_id
         self.token = None
-        self.httpClient = httpx.AsyncClient()
+        self.token_expires = 0.0
+        self.token_lifetime = token_lifetime
+        self.__owns_client = http_client is None
+        if http_client is None:
+            http_client = httpx.AsyncClient(
+                limits=DEFAULT_LIMITS, timeout=DEFAULT_TIMEOUT, http2=HTTP2_AVAILABLE
+            )
+        self.httpClient = http_client
+        self.cycle_timeout = cycle_timeout
+        self.stale_ttl = stale_ttl
+        self.circuit_breaker = CircuitBreaker()
+        self.metrics = Metrics()
+        self.trace = RequestTrace()
+        self.trace_mode = trace_mode
+        self.__log_sampler = LogSampler()
+        self.scheduler = scheduler or get_scheduler(urlsplit(API_URL).hostname)
         self.devices = []
+        self.devices_changed = False
+        self.poll_mode = PollMode(poll_mode)
+        self.poll_intervals = {**POLL_INTERVALS, **(poll_intervals or {})}
+        self.__semaphore = asyncio.Semaphore(max(1, int(max_concurrency)))
+        # Phase of the poll slot shared by all devices in list and hybrid mode.
+        self.phase = zlib.crc32(str(unique_id).encode()) / 2**32
+        self.__login_task = None
 
     async def connect(self):
         """Connect user to URL."""
         await self.fetch_devices()
 
+    async def close(self):
+        """Stop background work and close the HTTP client if owned."""
+        for dev in self.devices:
+            await dev.close()
+        if self.__owns_client:
+            await self.httpClient.aclose()
+
     async def login(self):
-        """Authenticate with email and password to Agua IOT."""
+        """Authenticate with email and password to Agua IOT.
+
+        Concurrent callers share a single in-flight login request, which
+        returns the new token.
+        """
+        if self.__login_task is None:
+            self.__login_task = asyncio.create_task(self.__login())
+            self.__login_task.add_done_callback(self.__login_done)
+        return await asyncio.shield(self.__login_task)
+
+    def __login_done(self, task):
+        self.__login_task = None
+        if not task.cancelled():
+            # Mark the exception as retrieved when every waiter is gone.
+            task.exception()
 
+    async def __login(self):
         url = API_URL + API_PATH_LOGIN
 
         payload = {
@@ -58,79 +185,433 @@ class totalcontrol:
             PayloadField.PASSWORD: self.password,
             PayloadField.UNIQUE_ID: self.unique_id,
         }
-        res = await self.handle_webcall(url, payload)
+        res = await self.handle_webcall(url, payload, RequestPriority.WRITE)
         if res is False:
             raise totalcontrolError("Error while login")
 
-        data = res[JsonDataField.DATA]
-        self.token = data[JsonDataField.TOKEN]
-        return True
+        data = res.get(JsonDataField.DATA)
+        token = data.get(JsonDataField.TOKEN) if isinstance(data, dict) else None
+        if not token:
+            raise totalcontrolError("Login response without token")
+        self.token = token
+        self.token_expires = time.monotonic() + self.token_lifetime
+        return token
+
+    async def __get_token(self):
+        if self.token is None or time.monotonic() >= self.token_expires:
+            # Another caller may invalidate self.token before this one resumes.
+            return await self.login()
+        return self.token
+
+    def invalidate_token(self, token):
+        """Forget token, unless it was already replaced by a newer login."""
+        if self.token == token:
+            self.token = None
 
     async def fetch_devices(self):
         """Fetch heating devices."""
-        if self.token is None:
-            await self.login()
+        for dev in await self.__fetch_device_list():
+            self.devices.append(self.__create_device(dev))
+
+    async def sync_devices(self):
+        """Reconcile the devices with the stove list of the account.
+
+        Returns True, and sets devices_changed, when stoves were added,
+        removed or renamed. Known devices keep their statistics and take the
+        state of the list, which counts as their refresh.
+        """
+        entries = await self.__fetch_device_list()
+        changed = self.__reconcile(entries)
+        self.__apply_list_states(entries)
+        return changed
+
+    def __create_device(self, dev):
+        return Device(
+            dev[JsonDataField.SERIAL],
+            dev.get(JsonDataField.CODE_ART),
+            dev.get(JsonDataField.FRIENDLY_NAME) or dev[JsonDataField.SERIAL],
+            MANUFACTURER,
+            dev[JsonDataField.MAC],
+            dev.get(JsonDataField.STOVE_STATE),
+            self,
+        )
+
+    def __reconcile(self, entries):
+        known = {dev.mac: dev for dev in self.devices}
+        devices = []
+        changed = len(entries) != len(self.devices)
+        for entry in entries:
+            device = known.get(entry[JsonDataField.MAC])
+            if device is None:
+                devices.append(self.__create_device(entry))
+                changed = True
+                continue
+            name = entry.get(JsonDataField.FRIENDLY_NAME) or device.name
+            codArt = entry.get(JsonDataField.CODE_ART) or device.codArt
+            if (name, codArt) != (device.name, device.codArt):
+                device.name = name
+                device.codArt = codArt
+                changed = True
+            devices.append(device)
 
-        url = API_URL + API_PATH_DEVICE_LIST
+        if changed:
+            self.devices = devices
+            self.devices_changed = True
+        return changed
 
-        payload = {PayloadField.TOKEN: self.token}
+    def as_cache(self):
+        """Return the session token and device snapshots for storage."""
+        return {
+            "saved": time.time(),
+            "token": self.token,
+            "token_expires_in": max(0.0, self.token_expires - time.monotonic()),
+            "devices": [dev.as_cache() for dev in self.devices],
+        }
+
+    def restore_cache(self, cache):
+        """Restore the session token and devices from storage.
+
+        Returns False when the cache holds no usable devices. Restored devices
+        are due for polling once their cached snapshot is older than their
+        poll interval.
+        """
+        now = time.monotonic()
+        try:
+            elapsed = max(0.0, time.time() - cache["saved"])
+            devices = [
+                Device(
+                    dev["serial"],
+                    dev["codArt"],
+                    dev["name"],
+                    MANUFACTURER,
+                    dev["mac"],
+                    dev["state"],
+                    self,
+                    last_success=now - elapsed - dev["age"],
+                    statistics=dev.get("statistics"),
+                )
+                for dev in cache["devices"]
+            ]
+            token = cache["token"]
+            token_expires_in = cache["token_expires_in"] - elapsed
+        except (KeyError, TypeError, ValueError) as error:
+            _LOGGER.warning("Ignoring invalid device cache: %s", error)
+            return False
 
-        res = await self.handle_webcall(url, payload)
+        if not devices:
+            return False
+
+        self.devices = devices
+        if token and token_expires_in > 0:
+            self.token = token
+            self.token_expires = now + token_expires_in
+        return True
+
+    async def __fetch_device_list(self):
+        res = await self.handle_authenticated_webcall(API_PATH_DEVICE_LIST, {})
         if res is False:
-            self.token = None
             raise totalcontrolError("Error while fetching devices")
 
-        for dev in res[JsonDataField.DATA]:
-            device = Device(
-                dev[JsonDataField.SERIAL],
-                dev[JsonDataField.CODE_ART],
-                dev[JsonDataField.FRIENDLY_NAME],
-                MANUFACTURER,
-                dev[JsonDataField.MAC],
-                dev[JsonDataField.STOVE_STATE],
-                self,
+        try:
+            devices = parse_device_list(res.get(JsonDataField.DATA))
+        except ValueError as error:
+            raise totalcontrolError(f"Malformed device list: {error}") from error
+        if len(devices) != len(res[JsonDataField.DATA]):
+            _LOGGER.warning(
+                "Ignoring %s malformed stove list entries",
+                len(res[JsonDataField.DATA]) - len(devices),
             )
-            self.devices.append(device)
+        return devices
 
     async def fetch_device_information(self):
         """Fetch device information of heating devices."""
-        for dev in self.devices:
-            await dev.update()
+        await self.update(force=True)
+
+    async def update(self, force=False):
+        """Fetch device information of due heating devices concurrently.
+
+        Devices are only polled once their state dependent poll interval has
+        elapsed, unless ``force`` is set. In list and hybrid poll mode all
+        devices are refreshed from a single stove-list call once any device is
+        due, and only the devices returned by ``__update_from_device_list`` get
+        a stove-get-state call.
+
+        At most ``max_concurrency`` requests are in flight at the same time
+        and devices not refreshed within ``cycle_timeout`` are cancelled.
+        A failing device does not abort the others and keeps serving its last
+        snapshot while it is retried on its own backoff schedule; an error is
+        only raised when no device could be refreshed.
+        """
+        now = time.monotonic()
+        devices = [dev for dev in self.devices if force or dev.next_update <= now]
+        if not devices:
+            return
+
+        try:
+            await self.__update(devices)
+        finally:
+            self.metrics.poll_cycle.observe(time.monotonic() - now)
+
+    async def __update(self, devices):
+        if self.poll_mode != PollMode.DEVICE:
+            try:
+                devices = await self.__update_from_device_list()
+            except totalcontrolError:
+                for dev in devices:
+                    dev.record_failure()
+                raise
+            if not devices:
+                return
 
-    async def update(self):
-        """Fetch device information of heating device."""
+        tasks = [asyncio.create_task(self.__update_device(dev)) for dev in devices]
+        try:
+            _, pending = await asyncio.wait(tasks, timeout=self.cycle_timeout)
+        finally:
+            for task in tasks:
+                task.cancel()
+        if pending:
+            await asyncio.wait(pending)
+
+        failed = 0
+        for dev, task in zip(devices, tasks):
+            if task.cancelled():
+                failed += 1
+                _LOGGER.warning("Timeout while updating device %s", dev.name)
+            elif task.exception() is not None:
+                failed += 1
+                _LOGGER.warning(
+                    "Unable to update device %s: %s", dev.name, task.exception()
+                )
+
+        if failed == len(devices) and self.poll_mode == PollMode.DEVICE:
+            raise totalcontrolError("Error while updating all devices")
+
+    async def apply_registers(self, devices, registers):
+        """Apply the same register values to several devices, then refresh them.
+
+        Devices are written concurrently, at most max_concurrency at a time,
+        and refreshed together once all writes finished. Returns the written
+        keys, or the exception raised, by device.
+        """
+        for key, value in registers.items():
+            validate_write(key, value)
+
+        async def apply(device):
+            async with self.__semaphore:
+                return await device.apply_registers(registers)
+
+        results = await asyncio.gather(
+            *(apply(device) for device in devices), return_exceptions=True
+        )
+        try:
+            await self.__update(devices)
+        except totalcontrolError as error:
+            _LOGGER.warning("Unable to refresh devices after writing: %s", error)
+
+        return dict(zip(devices, results))
+
+    async def __update_from_device_list(self):
+        """Update devices from stove-list and return those needing a detail call.
+
+        A device needs a detail call when it is missing from the list or its
+        snapshot lacks registers. In hybrid mode, devices whose snapshot
+        changed since the last cycle are confirmed with a detail call as well.
+        """
+        entries = await self.__fetch_device_list()
+        self.__reconcile(entries)
+        return self.__apply_list_states(entries)
+
+    def __apply_list_states(self, entries):
+        """Apply the stove-list states, return the devices needing a detail call."""
+        states = {
+            dev[JsonDataField.MAC]: dev.get(JsonDataField.STOVE_STATE)
+            for dev in entries
+        }
+
+        pending = []
         for dev in self.devices:
-            await dev.update()
+            state = states.get(dev.mac)
+            if not state or any(key not in state for key in REGISTER_KEYS):
+                pending.append(dev)
+                continue
+            try:
+                changed = dev.update_from_state(state)
+            except totalcontrolError:
+                pending.append(dev)
+                continue
+            if changed and self.poll_mode == PollMode.HYBRID:
+                pending.append(dev)
+
+        return pending
+
+    async def __update_device(self, device):
+        async with self.__semaphore:
+            await device.update()
 
-    async def handle_webcall(self, url, payload):
-        """Fetch data from Extraflame site."""
+    def poll_interval(self, device):
+        """Return the poll interval of a device based on its machine state."""
+        if time.monotonic() - device.last_write < BURST_DURATION:
+            return self.poll_intervals[CONF_INTERVAL_BURST]
+
+        option = MACHINE_STATE_POLL_INTERVALS.get(
+            device.get_register_value(JsonDataField.MACHINE_STATE),
+            CONF_INTERVAL_WORKING,
+        )
+        return self.poll_intervals[option]
+
+    def next_update_in(self):
+        """Return the seconds until the next device is due for polling."""
+        if not self.devices:
+            return self.poll_intervals[CONF_INTERVAL_WORKING]
+
+        next_update = min(dev.next_update for dev in self.devices)
+        return max(0.0, next_update - time.monotonic())
+
+    async def handle_authenticated_webcall(
+        self, path, payload, priority=RequestPriority.POLL
+    ):
+        """Fetch data with the session token, re-login and retry once if rejected."""
+        for _ in range(2):
+            token = await self.__get_token()
+            try:
+                return await self.handle_webcall(
+                    API_URL + path, {PayloadField.TOKEN: token, **payload}, priority
+                )
+            except totalcontrolTokenError:
+                self.invalidate_token(token)
+
+        return False
+
+    async def handle_webcall(self, url, payload, priority=RequestPriority.POLL):
+        """Fetch data from Extraflame site.
+
+        Every attempt waits for the request scheduler at the given priority.
+        Transient errors (connection errors, 5xx and 429 responses) are retried
+        with jittered exponential backoff. Repeated transient failures open the
+        circuit breaker, which rejects requests until its cool-down elapsed.
+        Raises totalcontrolTokenError when the session token is rejected.
+        """
+        endpoint = url.rpartition("/")[2]
+        mac = payload.get(PayloadField.MAC)
+        if not self.circuit_breaker.allow_request():
+            _LOGGER.debug("Circuit breaker open, skipping request to: %s", url)
+            self.metrics.record_rejected(endpoint, mac)
+            return False
+
+        try:
+            for attempt in range(REQUEST_RETRIES + 1):
+                if attempt:
+                    backoff = min(
+                        REQUEST_BACKOFF_MAX, REQUEST_BACKOFF_BASE * 2**attempt
+                    )
+                    await asyncio.sleep(random.uniform(0, backoff))
+
+                queued = time.monotonic()
+                await self.scheduler.acquire(priority)
+                wait = time.monotonic() - queued
+                res, transient = await self.__post(
+                    url, payload, endpoint, mac, attempt, wait
+                )
+                if not transient:
+                    self.circuit_breaker.record_success()
+                    self.metrics.record_result(
+                        endpoint, mac, res is not False, attempt
+                    )
+                    return res
+        except totalcontrolTokenError:
+            # The cloud answered, only the token has to be renewed.
+            self.circuit_breaker.record_success()
+            self.metrics.record_result(endpoint, mac, False, attempt)
+            raise
+        except BaseException:
+            # Cancelled, e.g. by the cycle deadline, or failed unexpectedly.
+            self.circuit_breaker.release()
+            raise
+
+        self.circuit_breaker.record_failure()
+        self.metrics.record_result(endpoint, mac, False, REQUEST_RETRIES)
+        return False
+
+    async def __post(self, url, payload, endpoint, mac, attempt=0, wait=0):
+        """Send a request, return its result and whether a failure is transient."""
         headers = HEADER
 
+        start = time.monotonic()
+        size = 0
+        status = None
+        result_code = None
+        error = None
         try:
-            _LOGGER.debug("URL: %s - HEADERS: %s DATA: %s", url, headers, payload)
+            if self.trace_mode:
+                _LOGGER.debug(
+                    "Request %s attempt %s: %s", url, attempt, LazyBody(payload)
+                )
             response = await self.httpClient.post(
                 url,
                 params=payload,
                 headers=headers,
                 follow_redirects=False,
-                timeout=DEFAULT_TIMEOUT_VALUE,
+                timeout=DEFAULT_TIMEOUT,
             )
+            size = len(response.content)
+            status = response.status_code
 
-            _LOGGER.debug("Status_code: %s", response.status_code)
+            if response.status_code == 429 or response.status_code >= 500:
+                return False, True
 
             if response.status_code == 200:
-                resJson = response.json()
-                if resJson:
-                    _LOGGER.debug("Response.json: %s", resJson)
-                    if resJson[JsonDataField.RESULT_CODE] == 0:
-                        return resJson
+                resJson = loads(response.content)
+                if isinstance(resJson, dict):
+                    if self.trace_mode:
+                        _LOGGER.debug("Response %s: %s", url, LazyBody(resJson))
+                    result_code = resJson.get(JsonDataField.RESULT_CODE)
+                    if result_code == 0:
+                        return resJson, False
+                    if result_code == RESULT_CODE_INVALID_TOKEN:
+                        raise totalcontrolTokenError("Invalid or expired token")
 
-        except httpx.TransportError as error:
-            _LOGGER.error("Connection error to: %s, error: %s", url, error)
-        except JSONDecodeError as error:
-            _LOGGER.error("Invalid json in response: %s", error)
+        except httpx.TransportError as err:
+            error = type(err).__name__
+            suppressed = self.__log_sampler.allow((endpoint, error))
+            if suppressed is not None:
+                _LOGGER.error(
+                    "Connection error to: %s, error: %s (%s similar suppressed)",
+                    url,
+                    err,
+                    suppressed,
+                )
+            return False, True
+        except JSONDecodeError as err:
+            _LOGGER.error("Invalid json in response: %s", err)
+            error = type(err).__name__
+        finally:
+            duration = time.monotonic() - start
+            self.metrics.record_attempt(endpoint, mac, duration, size)
+            self.trace.record(
+                endpoint, mac, attempt, wait, duration, status, result_code, size, error
+            )
+            if _LOGGER.isEnabledFor(logging.DEBUG):
+                self.__log_exchange(endpoint, mac, status, result_code, duration)
 
-        return False
+        return False, False
+
+    def __log_exchange(self, endpoint, mac, status, result_code, duration):
+        """Log a one-line summary, sampled per endpoint, device and outcome."""
+        if not self.trace_mode:
+            suppressed = self.__log_sampler.allow((endpoint, mac, status, result_code))
+            if suppressed is None:
+                return
+        else:
+            suppressed = 0
+        _LOGGER.debug(
+            "%s %s: status %s, resultCode %s in %.3fs (%s similar suppressed)",
+            endpoint,
+            mac or "-",
+            status,
+            result_code,
+            duration,
+            suppressed,
+        )
 
 
 class Device:
@@ -145,6 +626,8 @@ class Device:
         mac,
         stovestate,
         totalcontrolmanager,
+        last_success=None,
+        statistics=None,
     ) -> None:
         """Initialize extraflame device."""
         self.id = serial
@@ -154,124 +637,430 @@ class Device:
         self.mac = mac
         self.is_online = 1
         self.__totalcontrol = totalcontrolmanager
-        self.__update_information(stovestate)
+        self.__pending_writes = {}
+        self.__queued_writes = {}
+        self.__inflight_writes = {}
+        self.__write_lock = asyncio.Lock()
+        self.__confirm_task = None
+        self.__listeners = []
+        self.last_write = float("-inf")
+        self.last_success = time.monotonic() if last_success is None else last_success
+        self.failures = 0
+        self.revision = 0
+        self.changed_registers = frozenset()
+        self.__register_revisions = [0] * len(REGISTER_TABLE)
+        self.__values = [None] * len(REGISTER_TABLE)
+        self.history = RegisterHistory(HISTORY_REGISTERS)
+        self.statistics = DeviceStatistics(statistics)
+        try:
+            self.__update_information(stovestate)
+        except totalcontrolError as error:
+            _LOGGER.warning("Ignoring initial state of device %s: %s", name, error)
+        # Spread the polls of all devices evenly over the poll interval.
+        self.__phase = zlib.crc32(str(mac or serial).encode()) / 2**32
+        self.next_update = self.__next_poll(self.last_success)
 
-    async def update(self):
-        """Update device entities."""
-        await self.__update_device_information()
+    def as_cache(self):
+        """Return the device description and snapshot for storage."""
+        return {
+            "serial": self.id,
+            "codArt": self.codArt,
+            "name": self.name,
+            "mac": self.mac,
+            "age": time.monotonic() - self.last_success,
+            "state": dict(zip(REGISTER_KEYS, self.__values)),
+            "statistics": self.statistics.as_cache(),
+        }
 
-    async def __update_device_information(self):
-        if self.__totalcontrol.token is None:
-            await self.__totalcontrol.login()
+    def add_listener(self, update_callback):
+        """Listen for device updates outside of the polling cycle."""
+        self.__listeners.append(update_callback)
 
-        url = API_URL + API_PATH_DEVICE_INFO
+        def remove_listener():
+            self.__listeners.remove(update_callback)
 
-        payload = {
-            PayloadField.TOKEN: self.__totalcontrol.token,
-            PayloadField.MAC: self.mac,
-        }
+        return remove_listener
+
+    async def close(self):
+        """Cancel pending confirmation and write tasks."""
+        tasks = []
+        for _, future, task in self.__queued_writes.values():
+            future.cancel()
+            tasks.append(task)
+        if self.__confirm_task is not None:
+            tasks.append(self.__confirm_task)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
 
-        res = await self.__totalcontrol.handle_webcall(url, payload)
+    def __notify_listeners(self):
+        for update_callback in list(self.__listeners):
+            update_callback()
+
+    @property
+    def available(self):
+        """Return True while the last good snapshot is within the staleness TTL."""
+        return self.stale_in() > 0
+
+    @property
+    def heatup_rate(self):
+        """Return the water temperature trend in °C/min, from the history."""
+        slope = self.history.slope(JsonDataField.WATER_TEMPERATURE, HEATUP_WINDOW)
+        return None if slope is None else slope * 60
+
+    def stale_in(self):
+        """Return the seconds until the last good snapshot becomes stale."""
+        return self.last_success + self.__totalcontrol.stale_ttl - time.monotonic()
+
+    async def update(self, priority=RequestPriority.POLL):
+        """Update device entities.
+
+        Listeners are notified as soon as this device is updated, without
+        waiting for the other devices of the polling cycle.
+        """
+        try:
+            await self.__update_device_information(priority)
+        except (totalcontrolError, asyncio.CancelledError):
+            self.record_failure()
+            raise
+
+        self.__record_success()
+        self.__notify_listeners()
+
+    def __record_success(self):
+        self.last_success = time.monotonic()
+        self.failures = 0
+        self.__schedule_next_update()
+
+    def record_failure(self):
+        """Keep the last snapshot and retry this device with backoff."""
+        self.failures += 1
+        delay = min(
+            RETRY_INITIAL_DELAY * 2 ** (self.failures - 1),
+            RETRY_MAX_DELAY,
+            self.__totalcontrol.poll_interval(self),
+        )
+        self.next_update = time.monotonic() + delay + self.__jitter(delay)
+
+    def __schedule_next_update(self):
+        self.next_update = self.__next_poll(time.monotonic())
+
+    def __next_poll(self, base):
+        """Return the poll time about one poll interval after base.
+
+        In device mode polls land on this device's phase offset within the
+        interval, with a small jitter, so the devices of an account do not
+        poll in one burst. In list and hybrid mode a single stove-list call
+        updates all devices, so they share the phase of the account instead.
+        """
+        interval = self.__totalcontrol.poll_interval(self)
+        if self.__totalcontrol.poll_mode == PollMode.DEVICE:
+            phase = self.__phase
+        else:
+            phase = self.__totalcontrol.phase
+        target = base + interval
+        slot = target - (target - phase * interval) % interval
+        if slot < base + interval / 2:
+            slot += interval
+        return slot + self.__jitter(interval)
+
+    def __jitter(self, interval):
+        """Return a random poll offset, none when devices share one slot."""
+        if self.__totalcontrol.poll_mode != PollMode.DEVICE:
+            return 0
+        return random.uniform(-POLL_JITTER, POLL_JITTER) * interval
+
+    async def __update_device_information(self, priority):
+        payload = {PayloadField.MAC: self.mac}
+
+        res = await self.__totalcontrol.handle_authenticated_webcall(
+            API_PATH_DEVICE_INFO, payload, priority
+        )
         if res is False:
-            self.__totalcontrol.token = None
             raise totalcontrolError("Error while making device buffer read request.")
 
-        self.__update_information(res[JsonDataField.DATA])
+        self.__update_information(res.get(JsonDataField.DATA))
+
+    def update_from_state(self, stovestate):
+        """Update device from a stove-list snapshot, return True if it changed."""
+        revision = self.revision
+        self.__update_information(stovestate)
+        self.__record_success()
+        return self.revision != revision
 
     def __update_information(self, data):
-        information_dict = {}
-        for key in REGISTERS:
-            information_dict[key] = data[key]
+        try:
+            values = parse_state(data, self.__values)
+        except ValueError as error:
+            raise totalcontrolError(
+                f"Malformed state of device {self.name}: {error}"
+            ) from error
 
-        self.__information_dict = information_dict
+        now = time.monotonic()
+        self.history.append(now, values)
+        self.statistics.update(now, values)
 
-    async def __request_writing(self, key, value):
-        if self.__totalcontrol.token is None:
-            await self.__totalcontrol.login()
+        # Keep optimistic values until the stove reports them or they expire.
+        for register, (value, _, deadline) in list(self.__pending_writes.items()):
+            if values[register.index] == value:
+                del self.__pending_writes[register]
+            elif now < deadline:
+                values[register.index] = value
+            else:
+                del self.__pending_writes[register]
+                _LOGGER.warning(
+                    "Device %s did not apply %s=%s, rolled back to %s",
+                    self.name,
+                    register.key,
+                    value,
+                    values[register.index],
+                )
+
+        self.__set_values(values)
 
-        url = API_URL + API_PATH_DEVICE_WRITING
+    def __set_values(self, values):
+        """Store a register snapshot and record which registers changed."""
+        previous = self.__values
+        changed = frozenset(
+            key
+            for key, value, old in zip(REGISTER_KEYS, values, previous)
+            if value != old
+        )
+        self.__values = values
+        self.changed_registers = changed
+        if changed:
+            self.revision += 1
+            for key in changed:
+                self.__register_revisions[REGISTER_TABLE[key].index] = self.revision
 
+    def changed_since(self, revision, keys):
+        """Return True if one of the registers changed after revision."""
+        revisions = self.__register_revisions
+        return any(revisions[REGISTER_TABLE[key].index] > revision for key in keys)
+
+    def __apply_optimistic(self, writes):
+        """Apply written (register, value) pairs and confirm them in one poll."""
+        self.last_write = time.monotonic()
+        deadline = self.last_write + CONFIRM_TIMEOUT
+        values = list(self.__values)
+        for register, value in writes:
+            previous = self.__values[register.index]
+            if register in self.__pending_writes:
+                previous = self.__pending_writes[register][1]
+            self.__pending_writes[register] = (value, previous, deadline)
+            values[register.index] = value
+        self.__set_values(values)
+        self.__schedule_next_update()
+        self.__notify_listeners()
+
+        if self.__confirm_task is None or self.__confirm_task.done():
+            self.__confirm_task = asyncio.get_running_loop().create_task(
+                self.__confirm_writes()
+            )
+
+    async def __confirm_writes(self):
+        """Poll this device with backoff until pending writes are confirmed."""
+        delay = CONFIRM_INITIAL_DELAY
+        while self.__pending_writes:
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, CONFIRM_MAX_DELAY)
+            try:
+                await self.update(RequestPriority.CONFIRM)
+            except totalcontrolError as error:
+                _LOGGER.debug("Unable to confirm writes of %s: %s", self.name, error)
+                self.__expire_pending_writes()
+                self.__notify_listeners()
+
+    def __expire_pending_writes(self):
+        """Roll back pending writes past their deadline to the last known value."""
+        now = time.monotonic()
+        values = list(self.__values)
+        for register, (value, previous, deadline) in list(
+            self.__pending_writes.items()
+        ):
+            if now >= deadline:
+                del self.__pending_writes[register]
+                values[register.index] = previous
+                _LOGGER.warning(
+                    "Unable to confirm %s=%s on device %s, rolled back to %s",
+                    register.key,
+                    value,
+                    self.name,
+                    previous,
+                )
+
+        self.__set_values(values)
+
+    async def __request_writing(self, key, value):
         payload = {
-            PayloadField.TOKEN: self.__totalcontrol.token,
             PayloadField.MAC: self.mac,
             PayloadField.PARAMETER_ID: key,
             PayloadField.PARAMETER_VALUE: value,
         }
 
-        res = await self.__totalcontrol.handle_webcall(url, payload)
+        res = await self.__totalcontrol.handle_authenticated_webcall(
+            API_PATH_DEVICE_WRITING, payload, RequestPriority.WRITE
+        )
         if res is False:
-            self.__totalcontrol.token = None
             raise totalcontrolError("Error while request device writing")
 
     @property
     def registers(self):
         """Returns list of registers."""
-        return list(REGISTERS.keys())
+        return REGISTER_KEYS
 
     def get_register(self, key):
-        """Return register by key."""
-        try:
-            register = REGISTERS[key]
-            register["value"] = self.__information_dict[key]
-        except (KeyError, ValueError):
+        """Return a copy of the register definition with its value by key."""
+        register = REGISTER_TABLE.get(key)
+        if register is None:
             return {}
-        return register
+        return {**register.as_dict(), "value": self.__values[register.index]}
 
     def get_register_value(self, key):
         """Return register value by key."""
-        return self.get_register(key).get("value")
+        register = REGISTER_TABLE.get(key)
+        if register is None:
+            return None
+        return self.__values[register.index]
 
     def get_register_value_min(self, key):
         """Return register min value by key."""
-        return self.get_register(key).get("set_min")
+        register = REGISTER_TABLE.get(key)
+        return None if register is None else register.set_min
 
     def get_register_value_max(self, key):
         """Return register max value by key."""
-        return self.get_register(key).get("set_max")
+        register = REGISTER_TABLE.get(key)
+        return None if register is None else register.set_max
+
+    def get_register_value_step(self, key):
+        """Return register step by key."""
+        register = REGISTER_TABLE.get(key)
+        return 1 if register is None else register.step
 
     def get_register_value_name(self, key):
         """Return register value name by key."""
-        return REGISTERS(key).get(self.get_register_value(key))
+        return self.get_register_value_options(key).get(self.get_register_value(key))
 
     def get_register_value_description(self, key):
         """Return register description by key."""
-        options = self.get_register_value_options(key)
-        if options:
-            return options.get(self.get_register_value(key))
+        register = REGISTER_TABLE.get(key)
+        if register is None:
+            return None
+
+        value = self.__values[register.index]
+        if register.options:
+            return register.options.get(value)
 
-        return self.get_register_value(key)
+        return value
 
     def get_register_value_options(self, key):
         """Return register option by key."""
-        if "enc_val" in self.get_register(key):
-            return self.get_register(key).get("enc_val")
-
-        return {}
+        register = REGISTER_TABLE.get(key)
+        if register is None:
+            return {}
+        return register.options
 
     async def set_register_value(self, key, value):
-        """Set register value."""
-        set_min = REGISTERS[key]["set_min"]
-        set_max = REGISTERS[key]["set_max"]
-        parameterId = REGISTERS[key]["parameterId"]
-        if float(value) < set_min or float(value) > set_max:
-            raise ValueError(f"Value must be between {set_min} and {set_max}: {value}")
-        parameterValue = int(value)
-        try:
-            await self.__request_writing(parameterId, parameterValue)
-        except totalcontrolError as error:
-            raise totalcontrolError(
-                f"Error while trying to set: key={key} value={value} error={error}"
-            ) from error
+        """Set register value.
+
+        Writes to the same register within WRITE_DEBOUNCE seconds are coalesced
+        into the latest value and writes of a device are serialized. Writes of
+        the value the register already has are skipped.
+
+        The value is applied to the register snapshot right away and confirmed
+        in the background by polling this device until the stove reports it.
+        """
+        register, parameterValue = validate_write(key, value)
+
+        queued = self.__queued_writes.get(register)
+        if queued is None:
+            # Compare with the value being written, it is not in the snapshot yet.
+            current = self.__inflight_writes.get(
+                register, self.__values[register.index]
+            )
+            if current == parameterValue:
+                return
+            future = asyncio.get_running_loop().create_future()
+            task = asyncio.get_running_loop().create_task(
+                self.__flush_write(register)
+            )
+            queued = self.__queued_writes[register] = [parameterValue, future, task]
+        else:
+            queued[0] = parameterValue
+
+        await asyncio.shield(queued[1])
+
+    async def apply_registers(self, registers):
+        """Bring the writable registers to the desired values in one batch.
+
+        All values are validated before anything is written and option names
+        are accepted for registers with options. Only registers differing from
+        the snapshot are written, in WRITE_ORDER, under the write lock, and
+        confirmed together by polling this device. Returns the keys written.
+        """
+        writes = [validate_write(key, value) for key, value in registers.items()]
+        writes.sort(key=lambda write: WRITE_ORDER.index(write[0].key))
+
+        async with self.__write_lock:
+            written = []
+            try:
+                for register, value in writes:
+                    queued = self.__queued_writes.get(register)
+                    if queued is not None:
+                        # Supersede a debounced write of the same register.
+                        queued[0] = value
+                    if self.__values[register.index] == value:
+                        continue
+                    self.__inflight_writes[register] = value
+                    await self.__request_writing(register.parameterId, value)
+                    written.append((register, value))
+            except totalcontrolError as error:
+                raise totalcontrolError(
+                    f"Error while trying to set: key={register.key} "
+                    f"value={value} error={error}"
+                ) from error
+            finally:
+                if written:
+                    self.__apply_optimistic(written)
+                self.__inflight_writes.clear()
+
+        return [register.key for register, _ in written]
+
+    async def __flush_write(self, register):
+        """Write the latest queued value of a register after the debounce delay."""
+        await asyncio.sleep(WRITE_DEBOUNCE)
+        async with self.__write_lock:
+            value, future, _ = self.__queued_writes.pop(register)
+            if self.__values[register.index] == value:
+                future.set_result(None)
+                return
+
+            self.__inflight_writes[register] = value
+            try:
+                await self.__request_writing(register.parameterId, value)
+                self.__apply_optimistic(((register, value),))
+            except totalcontrolError as error:
+                future.set_exception(
+                    totalcontrolError(
+                        f"Error while trying to set: key={register.key} "
+                        f"value={value} error={error}"
+                    )
+                )
+            except Exception as error:  # noqa: BLE001
+                future.set_exception(error)
+            else:
+                future.set_result(None)
+            finally:
+                self.__inflight_writes.pop(register, None)
+                # Never leave the callers of set_register_value waiting.
+                if not future.done():
+                    future.cancel()
 
     async def set_register_value_description(self, key, value_description):
         """Set register value description."""
-        try:
-            options = self.get_register_value_options(key)
-            value = list(options.keys())[
-                list(options.values()).index(value_description)
-            ]
-        except (AttributeError, ValueError):
-            value = value_description
+        register = REGISTER_TABLE[key]
+        value = register.reverse_options.get(value_description, value_description)
 
         await self.set_register_value(key, value)
 
@@ -282,3 +1071,7 @@ class totalcontrolError(Exception):
     def __init__(self, message) -> None:
         """Initialize totalcontrolError."""
         Exception.__init__(self, message)
+
+
+class totalcontrolTokenError(totalcontrolError):
+    """Exception raised when the cloud rejects the session token."""
@@ -0,0 +1,127 @@
+"""Request tracing and debug logging helpers for the total control cloud."""
+
+import time
+
+DEFAULT_TRACE_SIZE = 200
+LOG_SAMPLE_INTERVAL = 300
+LOG_BODY_LIMIT = 4096
+REDACTED = "**REDACTED**"
+REDACT_KEYS = frozenset({"password", "token", "email"})
+
+
+def redact(data):
+    """Return a copy of a payload or response with credentials and tokens masked."""
+    if isinstance(data, dict):
+        return {
+            key: REDACTED if key in REDACT_KEYS else redact(value)
+            for key, value in data.items()
+        }
+    if isinstance(data, list):
+        return [redact(value) for value in data]
+    return data
+
+
+class LazyBody:
+    """Redact and truncate a body only when a log record is actually emitted."""
+
+    __slots__ = ("data", "limit")
+
+    def __init__(self, data, limit=LOG_BODY_LIMIT) -> None:
+        """Initialize the wrapper."""
+        self.data = data
+        self.limit = limit
+
+    def __str__(self) -> str:
+        """Return the redacted body, truncated to ``limit`` characters."""
+        text = str(redact(self.data))
+        if self.limit is not None and len(text) > self.limit:
+            return f"{text[: self.limit]}... ({len(text)} chars)"
+        return text
+
+
+class LogSampler:
+    """Let a repeated message through at most once per interval and key."""
+
+    def __init__(self, interval=LOG_SAMPLE_INTERVAL) -> None:
+        """Initialize the sampler."""
+        self.interval = interval
+        self.__last = {}
+        self.__suppressed = {}
+
+    def allow(self, key):
+        """Return the number of suppressed messages if ``key`` may be logged.
+
+        Returns None while the message has to be suppressed.
+        """
+        now = time.monotonic()
+        last = self.__last.get(key)
+        if last is not None and now - last < self.interval:
+            self.__suppressed[key] = self.__suppressed.get(key, 0) + 1
+            return None
+        self.__last[key] = now
+        return self.__suppressed.pop(key, 0)
+
+
+class TraceEntry:
+    """A single HTTP exchange, reused in place by the ring buffer."""
+
+    __slots__ = (
+        "timestamp",
+        "endpoint",
+        "mac",
+        "attempt",
+        "wait",
+        "duration",
+        "status",
+        "result_code",
+        "size",
+        "error",
+    )
+
+    def __init__(self) -> None:
+        """Initialize an empty entry."""
+        self.timestamp = None
+
+    def as_dict(self):
+        """Return the entry as a dict."""
+        return {field: getattr(self, field) for field in self.__slots__}
+
+
+class RequestTrace:
+    """Preallocated ring buffer of the last ``size`` HTTP exchanges.
+
+    No payloads are stored, so credentials and tokens never end up in it.
+    """
+
+    def __init__(self, size=DEFAULT_TRACE_SIZE) -> None:
+        """Initialize the ring buffer."""
+        self.__entries = [TraceEntry() for _ in range(size)]
+        self.__next = 0
+        self.__count = 0
+
+    def record(
+        self, endpoint, mac, attempt, wait, duration, status, result_code, size, error
+    ):
+        """Overwrite the oldest entry with a new exchange."""
+        entry = self.__entries[self.__next]
+        entry.timestamp = time.time()
+        entry.endpoint = endpoint
+        entry.mac = mac
+        entry.attempt = attempt
+        entry.wait = wait
+        entry.duration = duration
+        entry.status = status
+        entry.result_code = result_code
+        entry.size = size
+        entry.error = error
+        self.__next = (self.__next + 1) % len(self.__entries)
+        self.__count = min(self.__count + 1, len(self.__entries))
+
+    def as_list(self):
+        """Return the recorded exchanges, oldest first."""
+        size = len(self.__entries)
+        start = (self.__next - self.__count) % size
+        return [
+            self.__entries[(start + offset) % size].as_dict()
+            for offset in range(self.__count)
+        ]